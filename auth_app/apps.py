@@ -5,3 +5,6 @@ class AuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_app'
     verbose_name = 'Authentication'
+    
+    def ready(self):
+        import auth_app.signals  # noqa: F401
@@ -0,0 +1,21 @@
+from rest_framework import status
+from rest_framework.response import Response
+from auth_app.serializers import CustomUserSerializer
+from auth_app.views import UserProfileView
+from healthcare_api.async_views import AsyncReadView
+from healthcare_api.conditional import get_object_validators
+
+
+class AsyncUserProfileView(AsyncReadView):
+    """Async version of ``UserProfileView.get``; the user usually comes from ``user_cache``"""
+    
+    view_class = UserProfileView
+    
+    async def read(self, request, *args, **kwargs):
+        validators = get_object_validators(request, request.user, ['updated_at'])
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        serializer = CustomUserSerializer(request.user)
+        return validators.apply(Response(serializer.data, status=status.HTTP_200_OK))
@@ -0,0 +1,64 @@
+from asgiref.sync import sync_to_async
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from auth_app.cache import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that serves the token's user from ``user_cache``"""
+    
+    def _get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+    
+    def _check_cached_user(self, user, validated_token):
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        
+        return user
+    
+    def get_user(self, validated_token):
+        """Return the token's user, loading it from the database only on a cache miss"""
+        user_id = self._get_user_id(validated_token)
+        issued_at = validated_token.get('iat')
+        user, stamp = user_cache.get(user_id, issued_at)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user, issued_at, stamp)
+            return user
+        
+        return self._check_cached_user(user, validated_token)
+    
+    async def aget_user(self, validated_token):
+        """Async version of :meth:`get_user`; only a cache miss leaves the event loop"""
+        user_id = self._get_user_id(validated_token)
+        issued_at = validated_token.get('iat')
+        user, stamp = await user_cache.aget(user_id, issued_at)
+        if user is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            await user_cache.aset(user, issued_at, stamp)
+            return user
+        
+        return self._check_cached_user(user, validated_token)
+    
+    async def aauthenticate(self, request):
+        """Async version of ``authenticate`` for async views"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from auth_app.hashers import password_pool, verify_password
+
+
+class PooledPasswordBackend(ModelBackend):
+    """``ModelBackend`` that hashes on ``password_pool`` instead of the request thread.
+    
+    The user lookup and any password upgrade are saved from the request
+    thread, so the hashing workers never touch the database. Raises
+    ``PasswordPoolBusy`` when the pool is saturated.
+    """
+    
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway, so unknown emails take as long as wrong passwords
+            password_pool.run(make_password, password)
+            return None
+        
+        is_correct, new_encoded = password_pool.run(verify_password, password, user.password)
+        if not is_correct:
+            return None
+        if new_encoded is not None:
+            user.password = new_encoded
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
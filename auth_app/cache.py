@@ -0,0 +1,109 @@
+import copy
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from healthcare_api.caching import LocalLRUCache
+
+
+class UserCache:
+    """Two-tier cache of authenticated ``CustomUser`` instances.
+    
+    The local tier is an in-process LRU keyed by ``(user_id, iat)``, so a cached
+    entry is only reused for the token it was loaded for. The optional shared
+    tier is a Django cache that lets workers warm each other; its entries are
+    keyed by a per-user version that invalidation replaces, so a copy loaded
+    before a change and stored after it is never read. Committed saves and
+    deletes evict a user from the local tier of the current process and the
+    shared tier; other processes drop their local copy within ``LOCAL_TTL``
+    seconds.
+    
+    ``get`` returns a stamp along with the user; after a miss, pass it to
+    ``set`` with the user loaded from the database.
+    """
+    
+    key_prefix = 'auth_user'
+    
+    def __init__(self, options):
+        self.local = LocalLRUCache(maxsize=options['LOCAL_MAXSIZE'], ttl=options['LOCAL_TTL'])
+        self.shared_alias = options.get('SHARED_CACHE_ALIAS')
+        self.shared_ttl = options['SHARED_TTL']
+        # Bumped by every local invalidation, so a load that raced one is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+    
+    def version_key(self, user_id):
+        return f"{self.key_prefix}:{user_id}:version"
+    
+    def shared_key(self, user_id, version):
+        return f"{self.key_prefix}:{user_id}:{version}"
+    
+    def _cache_locally(self, user, issued_at, generation):
+        with self._lock:
+            if generation == self._generation:
+                self.local.set((user.pk, issued_at), user)
+    
+    def get(self, user_id, issued_at):
+        """Return ``(user, stamp)``, the user being a private copy or ``None`` on a miss"""
+        generation = self._generation
+        user = self.local.get((user_id, issued_at))
+        version = None
+        if user is None and self.shared is not None:
+            version = self.shared.get(self.version_key(user_id))
+            if version is not None:
+                user = self.shared.get(self.shared_key(user_id, version))
+                if user is not None:
+                    self._cache_locally(user, issued_at, generation)
+        return (copy.copy(user) if user is not None else None), (generation, version)
+    
+    async def aget(self, user_id, issued_at):
+        generation = self._generation
+        user = self.local.get((user_id, issued_at))
+        version = None
+        if user is None and self.shared is not None:
+            version = await self.shared.aget(self.version_key(user_id))
+            if version is not None:
+                user = await self.shared.aget(self.shared_key(user_id, version))
+                if user is not None:
+                    self._cache_locally(user, issued_at, generation)
+        return (copy.copy(user) if user is not None else None), (generation, version)
+    
+    def set(self, user, issued_at, stamp):
+        """Cache ``user``, loaded after the ``get`` that returned ``stamp``, for the token issued at ``issued_at``"""
+        generation, version = stamp
+        user = copy.copy(user)
+        self._cache_locally(user, issued_at, generation)
+        if self.shared is not None:
+            if version is None:
+                version = uuid.uuid4().hex
+                # Fails if an invalidation or another worker created the version first
+                if not self.shared.add(self.version_key(user.pk), version, None):
+                    return
+            self.shared.set(self.shared_key(user.pk, version), user, self.shared_ttl)
+    
+    async def aset(self, user, issued_at, stamp):
+        generation, version = stamp
+        user = copy.copy(user)
+        self._cache_locally(user, issued_at, generation)
+        if self.shared is not None:
+            if version is None:
+                version = uuid.uuid4().hex
+                if not await self.shared.aadd(self.version_key(user.pk), version, None):
+                    return
+            await self.shared.aset(self.shared_key(user.pk, version), user, self.shared_ttl)
+    
+    def invalidate(self, user_id):
+        """Drop every cached copy of a user"""
+        with self._lock:
+            self._generation += 1
+            self.local.delete_matching(lambda key: key[0] == user_id)
+        if self.shared is not None:
+            self.shared.set(self.version_key(user_id), uuid.uuid4().hex, None)
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE)
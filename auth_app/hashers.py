@@ -0,0 +1,129 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with the cost parameters from ``PASSWORD_HASHER_PARAMS``.
+    
+    The algorithm name is unchanged, so hashes made with Django's defaults
+    still verify and are re-hashed with these parameters on the next login.
+    """
+    
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHER_PARAMS['ARGON2_TIME_COST']
+    
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHER_PARAMS['ARGON2_MEMORY_COST']
+    
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_PARAMS['ARGON2_PARALLELISM']
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt with the cost parameters from ``PASSWORD_HASHER_PARAMS``"""
+    
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_HASHER_PARAMS['SCRYPT_WORK_FACTOR']
+    
+    @property
+    def block_size(self):
+        return settings.PASSWORD_HASHER_PARAMS['SCRYPT_BLOCK_SIZE']
+    
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_PARAMS['SCRYPT_PARALLELISM']
+    
+    @property
+    def maxmem(self):
+        # hashlib.scrypt needs 128 * N * r bytes, plus headroom
+        return 128 * self.work_factor * self.block_size * 2
+
+
+def verify_password(password, encoded):
+    """Check ``password`` against ``encoded`` and return ``(is_correct, new_encoded)``.
+    
+    ``new_encoded`` is a hash made with the preferred hasher when the stored
+    one uses another hasher or outdated parameters, and ``None`` otherwise.
+    Nothing is written here, so the caller decides where the update is saved.
+    """
+    rehashed = []
+    is_correct = hashers.check_password(
+        password, encoded, setter=lambda raw: rehashed.append(hashers.make_password(raw))
+    )
+    return is_correct, (rehashed[0] if rehashed else None)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when no hashing slot frees up within ``WAIT_TIMEOUT``"""
+
+
+class PasswordHashingPool:
+    """Bounded pool of threads that run password hashing for request threads.
+    
+    At most ``WORKERS`` hashes run at once, which with hashers that release
+    the GIL (hashlib's PBKDF2 and scrypt, argon2-cffi) is one per core.
+    Another ``MAX_PENDING`` may wait for a worker; a request that finds every
+    slot taken for ``WAIT_TIMEOUT`` seconds gets :class:`PasswordPoolBusy`
+    instead of queueing, so a burst of logins is turned away early rather
+    than piling up behind CPU-bound work. ``WORKERS = 0`` hashes in the
+    calling thread, keeping only the admission limit.
+    
+    The executor is created on first use in each process, after gunicorn
+    has forked its workers.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+        self._slots = None
+    
+    def _start(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                options = settings.PASSWORD_HASHING_POOL
+                workers = options['WORKERS']
+                self._executor = (
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing') if workers else None
+                )
+                self._slots = threading.BoundedSemaphore(max(workers, 1) + options['MAX_PENDING'])
+                self._pid = os.getpid()
+        return self._executor, self._slots
+    
+    def run(self, func, *args):
+        """Call ``func(*args)`` on a hashing worker and return its result"""
+        executor, slots = self._start()
+        if not slots.acquire(timeout=settings.PASSWORD_HASHING_POOL['WAIT_TIMEOUT']):
+            raise PasswordPoolBusy('Too many password checks in progress')
+        try:
+            if executor is None:
+                return func(*args)
+            return executor.submit(func, *args).result()
+        finally:
+            slots.release()
+    
+    def reset(self):
+        """Drop the executor so the next call starts one from the current settings"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._pid = self._executor = self._slots = None
+
+
+password_pool = PasswordHashingPool()
+
+
+@receiver(setting_changed)
+def reset_password_pool(setting, **kwargs):
+    if setting == 'PASSWORD_HASHING_POOL':
+        password_pool.reset()
@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from auth_app.models import RevokedToken
+
+
+class Command(BaseCommand):
+    """Delete revocation rows for refresh tokens that have expired"""
+    
+    help = 'Delete expired RevokedToken rows (and expired simplejwt blacklist rows, if that app is installed).'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        # An expired token fails verification anyway, so its revocation is moot
+        now = timezone.now()
+        models = [RevokedToken]
+        if apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+            from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+            models.append(OutstandingToken)
+        
+        for model in models:
+            deleted = 0
+            while True:
+                pks = list(model.objects.filter(expires_at__lt=now).values_list('pk', flat=True)[:options['batch_size']])
+                if not pks:
+                    break
+                deleted += model.objects.filter(pk__in=pks).delete()[0]
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {deleted} expired rows deleted")
@@ -48,7 +48,19 @@ class CustomUser(AbstractUser):
     
     class Meta:
         ordering = ['-created_at']
+        # email is indexed by its unique constraint; users are only looked up
+        # by email or primary key, so is_active needs no index of its own
         indexes = [
-            models.Index(fields=['email']),
-            models.Index(fields='-created_at'),
+            models.Index(fields=['-created_at']),
         ]
+
+
+class RevokedToken(models.Model):
+    """JWT ID of a revoked refresh token, kept until the token expires"""
+    
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.jti
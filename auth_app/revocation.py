@@ -0,0 +1,160 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from healthcare_api.caching import LocalLRUCache
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings, sized for ``error_rate`` false positives at ``capacity`` keys"""
+    
+    def __init__(self, capacity, error_rate):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+    
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DatabaseRevocations:
+    """Revoked JTIs stored as ``RevokedToken`` rows; ``prune_revoked_tokens`` deletes expired ones"""
+    
+    def add(self, jti, expires_at):
+        from auth_app.models import RevokedToken
+        
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=datetime.fromtimestamp(expires_at, timezone.utc))
+        except IntegrityError:
+            return False
+        return True
+    
+    def contains(self, jti):
+        from auth_app.models import RevokedToken
+        
+        return RevokedToken.objects.filter(jti=jti, expires_at__gt=datetime.now(timezone.utc)).exists()
+
+
+class CacheRevocations:
+    """Revoked JTIs stored in a Django cache, each expiring with its token"""
+    
+    key_prefix = 'revoked_token'
+    
+    def __init__(self, alias):
+        self.alias = alias
+    
+    def add(self, jti, expires_at):
+        timeout = max(int(expires_at - time.time()) + 1, 1)
+        return caches[self.alias].add(f"{self.key_prefix}:{jti}", 1, timeout)
+    
+    def contains(self, jti):
+        return caches[self.alias].get(f"{self.key_prefix}:{jti}") is not None
+
+
+class RevokedTokenStore:
+    """Revoked refresh tokens, by JWT ID, until the tokens expire.
+    
+    Each process keeps the revocations it has seen in a Bloom filter and an
+    exact LRU set whose entries expire at the token's ``exp``. A JTI that
+    is in both is revoked without another lookup, so a replayed token is
+    turned away locally. The shared backend (database rows or a Django
+    cache) holds revocations from every worker; revoking writes to it once
+    and reports whether the JTI was already there, which is what detects
+    a refresh token used twice.
+    
+    Without a shared backend, revocations only apply to this process, and
+    a JTI the filter matches but the exact set no longer holds (evicted,
+    or a false positive) is treated as revoked.
+    
+    Bloom filters cannot forget, so two generations are kept and the older
+    is dropped once it is a refresh token lifetime old, when every token
+    it recorded has expired, or when the newer one reaches capacity.
+    """
+    
+    def __init__(self, options, lifetime):
+        self.capacity = options['BLOOM_CAPACITY']
+        self.error_rate = options['BLOOM_ERROR_RATE']
+        self.lifetime = lifetime.total_seconds()
+        self.exact = LocalLRUCache(maxsize=options['LOCAL_MAXSIZE'], ttl=self.lifetime)
+        backend = options['SHARED_BACKEND']
+        if backend == 'database':
+            self.shared = DatabaseRevocations()
+        elif backend == 'cache':
+            self.shared = CacheRevocations(options['CACHE_ALIAS'])
+        elif not backend:
+            self.shared = None
+        else:
+            raise ImproperlyConfigured(f"Unknown REVOKED_TOKENS['SHARED_BACKEND']: {backend!r}")
+        self._lock = threading.Lock()
+        self._filters = [BloomFilter(self.capacity, self.error_rate)]
+        self._rotated_at = time.monotonic()
+    
+    def _maybe_revoked_locally(self, jti):
+        with self._lock:
+            return any(jti in bloom for bloom in self._filters)
+    
+    def _add_to_filter(self, jti):
+        """Add ``jti`` to the newest filter generation; the caller holds ``_lock``"""
+        if time.monotonic() - self._rotated_at >= self.lifetime or self._filters[0].count >= self.capacity:
+            self._filters = [BloomFilter(self.capacity, self.error_rate), self._filters[0]]
+            self._rotated_at = time.monotonic()
+        self._filters[0].add(jti)
+    
+    def revoke(self, jti, expires_at):
+        """Revoke ``jti`` until ``expires_at`` (a Unix timestamp); return ``False`` if it already was"""
+        if self.exact.get(jti) is not None:
+            return False
+        added = self.shared.add(jti, expires_at) if self.shared is not None else None
+        with self._lock:
+            if added is None:
+                added = not any(jti in bloom for bloom in self._filters)
+            self._add_to_filter(jti)
+        ttl = expires_at - time.time()
+        if ttl > 0:
+            self.exact.set(jti, True, ttl=ttl)
+        return added
+    
+    def is_revoked(self, jti, check_shared=True):
+        """Return whether ``jti`` is revoked.
+        
+        With ``check_shared=False`` the shared backend is only consulted to
+        confirm a local filter match, for callers that go on to ``revoke``
+        the token, which detects revocations by other workers anyway.
+        """
+        maybe_revoked = self._maybe_revoked_locally(jti)
+        if maybe_revoked and self.exact.get(jti) is not None:
+            return True
+        if self.shared is None:
+            return maybe_revoked
+        if maybe_revoked or check_shared:
+            return self.shared.contains(jti)
+        return False
+    
+    def clear(self):
+        """Forget this process's revocations; the shared backend is unchanged"""
+        with self._lock:
+            self._filters = [BloomFilter(self.capacity, self.error_rate)]
+            self._rotated_at = time.monotonic()
+        self.exact.clear()
+
+
+revoked_tokens = RevokedTokenStore(settings.REVOKED_TOKENS, settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'])
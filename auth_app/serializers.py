@@ -1,7 +1,15 @@
-from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from auth_app.hashers import password_pool
 from auth_app.models import CustomUser
+from auth_app.tokens import RevocableRefreshToken
+from healthcare_api.bulk import strip_unique_validators
+
+# SQLSTATE raised by PostgreSQL for a unique constraint violation
+UNIQUE_VIOLATION = '23505'
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -14,7 +22,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
 
 
 class RegisterSerializer(serializers.ModelSerializer):
-    """Serializer for user registration"""
+    """Serializer for user registration, optionally with a patient or doctor profile"""
     
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True, min_length=8)
@@ -23,31 +31,68 @@ class RegisterSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ['name', 'email', 'password', 'password_confirm']
     
+    def get_fields(self):
+        """Add the profile fields; email uniqueness is left to the database constraint"""
+        # Imported here because the profile serializers import this module
+        from doctors.serializers import DoctorRegistrationSerializer
+        from patients.serializers import PatientCreateUpdateSerializer
+        
+        fields = strip_unique_validators(super().get_fields(), ['email'])
+        fields['patient'] = PatientCreateUpdateSerializer(required=False)
+        fields['doctor'] = DoctorRegistrationSerializer(required=False)
+        return fields
+    
     def validate(self, data):
-        """Validate that passwords match"""
+        """Validate that passwords match and at most one profile is given"""
         if data['password'] != data['password_confirm']:
             raise serializers.ValidationError({
                 "password": "Passwords do not match."
             })
+        if 'patient' in data and 'doctor' in data:
+            raise serializers.ValidationError("Register either a patient or a doctor profile, not both.")
         return data
     
-    def validate_email(self, value):
-        """Validate that email is unique"""
-        if CustomUser.objects.filter(email=value).exists():
-            raise serializers.ValidationError("This email is already registered.")
-        return value
-    
     def create(self, validated_data):
-        """Create user and hash password"""
-        validated_data.pop('password_confirm')
-        user = CustomUser.objects.create_user(
-            email=validated_data['email'],
-            password=validated_data['password'],
-            name=validated_data['name']
+        """Create the user and its profile in one transaction, hashing the password on ``password_pool``"""
+        from doctors.models import Doctor
+        from patients.models import Patient
+        
+        patient_data = validated_data.pop('patient', None)
+        doctor_data = validated_data.pop('doctor', None)
+        user = CustomUser(
+            email=CustomUser.objects.normalize_email(validated_data['email']),
+            name=validated_data['name'],
+            password=password_pool.run(make_password, validated_data['password'])
         )
+        try:
+            with transaction.atomic():
+                user.save()
+                if patient_data is not None:
+                    Patient.objects.create(user=user, **patient_data)
+                elif doctor_data is not None:
+                    Doctor.objects.create(user=user, **doctor_data)
+        except IntegrityError as exc:
+            errors = unique_violation_errors(exc)
+            if errors is None:
+                raise
+            raise serializers.ValidationError(errors)
         return user
 
 
+def unique_violation_errors(exc):
+    """Return field errors for a unique constraint violation on registration, or ``None``"""
+    if getattr(exc.__cause__, 'pgcode', None) != UNIQUE_VIOLATION:
+        return None
+    constraint = exc.__cause__.diag.constraint_name or ''
+    if constraint.startswith(CustomUser._meta.db_table):
+        return {'email': ["This email is already registered."]}
+    if '_license_number_' in constraint:
+        return {'doctor': {'license_number': ["A doctor with this license number already exists."]}}
+    if '_email_' in constraint:
+        return {'doctor': {'email': ["A doctor with this email already exists."]}}
+    return None
+
+
 class LoginSerializer(serializers.Serializer):
     """Serializer for user login"""
     
@@ -73,10 +118,16 @@ class LoginSerializer(serializers.Serializer):
         if not user.is_active:
             raise serializers.ValidationError("This user account is inactive.")
         
-        refresh = RefreshToken.for_user(user)
+        refresh = RevocableRefreshToken.for_user(user)
         
         return {
             'access_token': str(refresh.access_token),
             'refresh_token': str(refresh),
             'user': user
         }
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer that rejects revoked refresh tokens and revokes rotated ones"""
+    
+    token_class = RevocableRefreshToken
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from auth_app.cache import user_cache
+from auth_app.models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, created=False, **kwargs):
+    """Evict a user from the authentication cache once a change to it commits"""
+    if created:
+        return
+    # Before the commit, a concurrent request could load the old row and cache it again
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
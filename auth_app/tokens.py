@@ -0,0 +1,25 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from auth_app.revocation import revoked_tokens
+
+
+class RevocableRefreshToken(RefreshToken):
+    """Refresh token checked against and revoked in ``revoked_tokens``.
+    
+    Stands in for simplejwt's ``BlacklistMixin``, which needs the
+    ``token_blacklist`` app and records every issued token in the database.
+    """
+    
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        # When rotation revokes this token, that write also catches reuse
+        revoked_on_refresh = api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+        if revoked_tokens.is_revoked(self.payload[api_settings.JTI_CLAIM], check_shared=not revoked_on_refresh):
+            raise TokenError(_("Token is blacklisted"))
+    
+    def blacklist(self):
+        """Revoke this token, failing if it was already revoked"""
+        if not revoked_tokens.revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp']):
+            raise TokenError(_("Token is blacklisted"))
@@ -1,12 +1,20 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from auth_app.views import RegisterView, LoginView, UserProfileView
+from healthcare_api.middleware import compression_exempt
 
 app_name = 'auth_app'
 
+profile_view = UserProfileView.as_view()
+if settings.ASYNC_READ_VIEWS:
+    from auth_app.async_views import AsyncUserProfileView
+    profile_view = AsyncUserProfileView.as_view(fallback=profile_view)
+
+# Register, login and refresh responses carry JWTs, which must never be compressed (BREACH)
 urlpatterns = [
-    path('register/', RegisterView.as_view(), name='register'),
-    path('login/', LoginView.as_view(), name='login'),
-    path('profile/', UserProfileView.as_view(), name='profile'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('register/', compression_exempt(RegisterView.as_view()), name='register'),
+    path('login/', compression_exempt(LoginView.as_view()), name='login'),
+    path('profile/', profile_view, name='profile'),
+    path('token/refresh/', compression_exempt(TokenRefreshView.as_view()), name='token_refresh'),
 ]
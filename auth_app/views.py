@@ -2,8 +2,21 @@ from rest_framework import viewsets, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from auth_app.hashers import PasswordPoolBusy
 from auth_app.models import CustomUser
 from auth_app.serializers import RegisterSerializer, LoginSerializer, CustomUserSerializer
+from auth_app.tokens import RevocableRefreshToken
+from doctors.serializers import DoctorSerializer
+from patients.serializers import PatientSerializer
+from healthcare_api.conditional import get_object_validators
+
+
+def password_pool_busy_response():
+    return Response(
+        {'error': 'Too many password checks in progress, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': '1'}
+    )
 
 
 class RegisterView(views.APIView):
@@ -12,18 +25,28 @@ class RegisterView(views.APIView):
     permission_classes = [AllowAny]
     
     def post(self, request):
-        """Register a new user"""
+        """Register a new user, with an optional patient or doctor profile, and return JWT tokens"""
         serializer = RegisterSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(
-                {
-                    'message': 'User registered successfully',
-                    'user': CustomUserSerializer(serializer.instance).data
-                },
-                status=status.HTTP_201_CREATED
-            )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user = serializer.save()
+        except PasswordPoolBusy:
+            return password_pool_busy_response()
+        
+        refresh = RevocableRefreshToken.for_user(user)
+        data = {
+            'message': 'User registered successfully',
+            'access_token': str(refresh.access_token),
+            'refresh_token': str(refresh),
+            'user': CustomUserSerializer(user).data
+        }
+        # Read from the instances just created, without querying for a missing profile
+        if 'patient' in serializer.validated_data:
+            data['patient'] = PatientSerializer(user.patient_profile).data
+        elif 'doctor' in serializer.validated_data:
+            data['doctor'] = DoctorSerializer(user.doctor_profile).data
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 class LoginView(views.APIView):
@@ -34,13 +57,17 @@ class LoginView(views.APIView):
     def post(self, request):
         """Login user and return JWT tokens"""
         serializer = LoginSerializer(data=request.data)
-        if serializer.is_valid():
+        try:
+            is_valid = serializer.is_valid()
+        except PasswordPoolBusy:
+            return password_pool_busy_response()
+        if is_valid:
             return Response(
                 {
                     'message': 'Login successful',
                     'access_token': serializer.validated_data['access_token'],
                     'refresh_token': serializer.validated_data['refresh_token'],
-                    'user': serializer.validated_data['user']
+                    'user': CustomUserSerializer(serializer.validated_data['user']).data
                 },
                 status=status.HTTP_200_OK
             )
@@ -54,12 +81,19 @@ class UserProfileView(views.APIView):
     
     def get(self, request):
         """Get current user profile"""
+        validators = get_object_validators(request, request.user, ['updated_at'])
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
         serializer = CustomUserSerializer(request.user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return validators.apply(Response(serializer.data, status=status.HTTP_200_OK))
     
     def put(self, request):
         """Update current user profile"""
-        serializer = CustomUserSerializer(request.user, data=request.data, partial=True)
+        # request.user may be a cached copy; saving it would write back stale columns
+        user = CustomUser.objects.get(pk=request.user.pk)
+        serializer = CustomUserSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Configure Django for a benchmark run from the repository root"""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthcare_api.settings')
+    import django
+    django.setup()
+
+
+def get_bench_user(email='bench@example.com', password='BenchPass123'):
+    """Return a user dedicated to benchmark runs, creating it on first use"""
+    from auth_app.models import CustomUser
+    
+    user = CustomUser.objects.filter(email=email).first()
+    if user is None:
+        user = CustomUser.objects.create_user(email=email, password=password, name='Benchmark User')
+    return user
+
+
+def get_client(user=None):
+    """Return an in-process test client, authenticated with a JWT when ``user`` is given"""
+    from django.conf import settings
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+    
+    headers = {'HTTP_HOST': settings.ALLOWED_HOSTS[0]}
+    if user is not None:
+        headers['HTTP_AUTHORIZATION'] = f"Bearer {RefreshToken.for_user(user).access_token}"
+    return Client(**headers)
+
+
+def time_requests(func, count):
+    """Call ``func`` ``count`` times and return the elapsed wall time in seconds"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return time.perf_counter() - start
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back, leaving the database unchanged"""
+    from django.db import transaction
+    
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
@@ -0,0 +1,166 @@
+"""Throughput and latency per worker under WSGI threads and ASGI async views.
+
+Usage: python -m benchmarks.concurrency [--concurrency 1,8,32,64] [--duration S]
+           [--threads N] [--db-latency MS] [--path URL]
+
+Starts one gunicorn worker per profile: a gthread WSGI worker with
+``--threads`` threads, and a uvicorn worker from deploy/gunicorn_asgi.conf.py
+with ASYNC_READ_VIEWS on. For each concurrency level, that many keep-alive
+connections issue GET requests back to back for ``--duration`` seconds.
+The load generator runs in this process, on the same machine, so absolute
+numbers are lower than with a separate client host; compare the profiles.
+
+``--db-latency`` routes the servers' PostgreSQL traffic through a local
+proxy that delays every response from the server, approximating a database
+on another host. Run it against a database seeded with
+``manage.py seed_healthcare``; no rows are created here.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import BASE_DIR, get_bench_user, percentile, setup_django
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _pipe(reader, writer, delay):
+    try:
+        while data := await reader.read(65536):
+            if delay:
+                await asyncio.sleep(delay)
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def start_latency_proxy(port, db_settings, delay):
+    """Forward ``port`` to PostgreSQL in a background thread, delaying server-to-client data"""
+    host, db_port = db_settings['HOST'], int(db_settings['PORT'])
+
+    async def handle(client_reader, client_writer):
+        if host.startswith('/'):
+            server_reader, server_writer = await asyncio.open_unix_connection(f"{host}/.s.PGSQL.{db_port}")
+        else:
+            server_reader, server_writer = await asyncio.open_connection(host, db_port)
+        await asyncio.gather(
+            _pipe(client_reader, server_writer, 0),
+            _pipe(server_reader, client_writer, delay),
+        )
+
+    async def serve():
+        server = await asyncio.start_server(handle, '127.0.0.1', port)
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+
+
+def start_server(profile, port, threads, env):
+    """Start a single-worker gunicorn for ``profile`` and wait until it accepts connections"""
+    command = [sys.executable, '-m', 'gunicorn', '--workers', '1', '--bind', f"127.0.0.1:{port}"]
+    if profile == 'wsgi':
+        command += ['--worker-class', 'gthread', '--threads', str(threads), 'healthcare_api.wsgi:application']
+    else:
+        command += ['--config', str(BASE_DIR / 'deploy' / 'gunicorn_asgi.conf.py')]
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{profile} server did not start")
+
+
+async def client(port, request, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status_line.split()[1] != b'200':
+                errors.append(status_line)
+    finally:
+        writer.close()
+
+
+async def run_load(port, request, concurrency, duration):
+    latencies, errors = [], []
+    stop_at = time.monotonic() + duration
+    await asyncio.gather(*(client(port, request, stop_at, latencies, errors) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', default='1,8,32,64')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--db-latency', type=float, default=0, help='milliseconds added per database response')
+    parser.add_argument('--path', default='/api/doctors/')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    token = RefreshToken.for_user(get_bench_user()).access_token
+    request = (
+        f"GET {args.path} HTTP/1.1\r\nHost: {settings.ALLOWED_HOSTS[0]}\r\n"
+        f"Authorization: Bearer {token}\r\nAccept: application/json\r\n\r\n"
+    ).encode('latin-1')
+
+    env = dict(os.environ)
+    if args.db_latency:
+        proxy_port = free_port()
+        start_latency_proxy(proxy_port, connection.settings_dict, args.db_latency / 1000)
+        env.update(DB_HOST='127.0.0.1', DB_PORT=str(proxy_port))
+
+    for profile in ('wsgi', 'asgi'):
+        port = free_port()
+        server = start_server(profile, port, args.threads, env)
+        try:
+            asyncio.run(run_load(port, request, 1, 1))
+            for concurrency in (int(value) for value in args.concurrency.split(',')):
+                latencies, errors = asyncio.run(run_load(port, request, concurrency, args.duration))
+                latencies.sort()
+                print(
+                    f"{profile} concurrency={concurrency:<4} {len(latencies) / args.duration:8.1f} req/s  "
+                    f"p50 {percentile(latencies, 0.50) * 1000:7.1f} ms  "
+                    f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  errors {len(errors)}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Requests per second with and without persistent database connections.
+
+Usage: python -m benchmarks.db_connections [--requests N] [--path URL]
+
+Requests go through the full Django handler in-process. The test client
+disconnects close_old_connections from the request signals, so it is called
+after every request here, closing (CONN_MAX_AGE=0) or keeping
+(CONN_MAX_AGE>0) the connection exactly as the WSGI handler would.
+
+The default path lists doctors with the doctor response cache switched off,
+so every request queries the database. ``/api/auth/profile/`` is answered
+from the in-process user cache and would measure no connection at all.
+"""
+import argparse
+
+from benchmarks.common import get_bench_user, get_client, setup_django, time_requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--path', default='/api/doctors/')
+    args = parser.parse_args()
+    
+    setup_django()
+    from django.conf import settings
+    from django.db import close_old_connections, connections
+    
+    # Cached responses would skip the database, and with it the connection being measured
+    settings.DOCTOR_RESPONSE_CACHE['ENABLED'] = False
+    client = get_client(get_bench_user())
+    
+    def request():
+        client.get(args.path)
+        close_old_connections()
+    
+    settings_dict = connections['default'].settings_dict
+    
+    for label, max_age in (('per-request connections', 0), ('persistent connections', 600)):
+        settings_dict['CONN_MAX_AGE'] = max_age
+        connections['default'].close()
+        request()
+        elapsed = time_requests(request, args.requests)
+        print(f"{label:<26} CONN_MAX_AGE={max_age:<4} {args.requests / elapsed:8.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
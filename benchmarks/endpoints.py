@@ -0,0 +1,264 @@
+"""Latency percentiles and throughput of the main API endpoints, as JSON lines.
+
+Usage: python -m benchmarks.endpoints [--scenarios NAME,...] [--requests N]
+           [--url URL] [--concurrency N] [--output FILE]
+
+Scenarios: login, doctor_list, doctor_search, mappings_by_patient,
+doctor_create, mapping_create, doctor_bulk_create and mapping_bulk_create.
+The bulk scenarios post ``BULK_SIZE`` items per request; ``rows_per_s``
+compares them with the single-row create scenarios. They read users, patients and doctors
+created by ``manage.py seed_healthcare`` (``--domain`` and ``--password``
+must match the seed run).
+
+Without ``--url`` requests go through the Django stack in-process, one at a
+time, and each scenario runs in a transaction that is rolled back. With
+``--url`` they are sent to a running server over ``--concurrency`` keep-alive
+connections, and rows created by the create scenarios are kept.
+
+Each scenario prints one JSON object per line with its request count,
+errors, req/s and mean/p50/p95/p99 latency in milliseconds, tagged with the
+current git commit; ``--output`` appends the same lines to a file so runs
+can be compared across commits.
+"""
+import argparse
+import itertools
+import json
+import subprocess
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit
+
+from benchmarks.common import BASE_DIR, get_client, percentile, rolled_back, setup_django
+
+BULK_SIZE = 50
+
+
+class ScenarioData:
+    """Ids, names and credentials the scenarios draw their requests from"""
+
+    def __init__(self, domain, password, run_id):
+        from auth_app.models import CustomUser
+        from doctors.models import Doctor
+        from healthcare_api.seed_data import LAST_NAMES
+        from mappings.models import PatientDoctorMapping
+        from patients.models import Patient
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        patients = list(
+            Patient.objects.filter(email__endswith=f"@{domain}").order_by('pk').values_list('pk', 'user__email')[:1000]
+        )
+        if not patients:
+            raise SystemExit(f"No seeded patients @{domain}; run manage.py seed_healthcare first")
+        self.patient_ids = [pk for pk, _ in patients]
+        self.emails = [email for _, email in patients]
+        self.password = password
+        self.doctor_ids = list(Doctor.objects.filter(email__endswith=f"@{domain}").values_list('pk', flat=True)[:200])
+        self.search_terms = LAST_NAMES
+        self.run_id = run_id
+        self.token = str(RefreshToken.for_user(CustomUser.objects.get(email=self.emails[0])).access_token)
+
+        assigned = set(PatientDoctorMapping.objects.filter(
+            patient_id__in=self.patient_ids, doctor_id__in=self.doctor_ids
+        ).values_list('patient_id', 'doctor_id'))
+        self.free_pairs = (
+            pair for pair in itertools.product(self.patient_ids, self.doctor_ids) if pair not in assigned
+        )
+        self._lock = threading.Lock()
+
+    def next_free_pair(self):
+        with self._lock:
+            return next(self.free_pairs)
+
+
+def login(data, index):
+    body = {'email': data.emails[index % len(data.emails)], 'password': data.password}
+    return 'POST', '/api/auth/login/', body, False
+
+
+def doctor_list(data, index):
+    return 'GET', f"/api/doctors/?page={index % 5 + 1}", None, True
+
+
+def doctor_search(data, index):
+    return 'GET', f"/api/doctors/?search={data.search_terms[index % len(data.search_terms)]}", None, True
+
+
+def mappings_by_patient(data, index):
+    return 'GET', f"/api/mappings/by_patient/?patient_id={data.patient_ids[index % len(data.patient_ids)]}", None, True
+
+
+def new_doctor(data, key):
+    return {
+        'first_name': 'Bench', 'last_name': f"Create {key}", 'email': f"bench-{data.run_id}-{key}@example.com",
+        'phone': '555-0100', 'gender': 'F', 'specialization': 'GP',
+        'license_number': f"BENCH-{data.run_id}-{key}", 'experience_years': 5, 'consultation_fee': '100.00',
+    }
+
+
+def doctor_create(data, index):
+    return 'POST', '/api/doctors/', new_doctor(data, index), True
+
+
+def mapping_create(data, index):
+    patient_id, doctor_id = data.next_free_pair()
+    return 'POST', '/api/mappings/', {'patient_id': patient_id, 'doctor_id': doctor_id}, True
+
+
+def doctor_bulk_create(data, index):
+    body = [new_doctor(data, f"bulk-{index}-{item}") for item in range(BULK_SIZE)]
+    return 'POST', '/api/doctors/bulk/', body, True
+
+
+def mapping_bulk_create(data, index):
+    pairs = [data.next_free_pair() for _ in range(BULK_SIZE)]
+    body = [{'patient_id': patient_id, 'doctor_id': doctor_id} for patient_id, doctor_id in pairs]
+    return 'POST', '/api/mappings/bulk/', body, True
+
+
+SCENARIOS = {
+    'login': login,
+    'doctor_list': doctor_list,
+    'doctor_search': doctor_search,
+    'mappings_by_patient': mappings_by_patient,
+    'doctor_create': doctor_create,
+    'mapping_create': mapping_create,
+    'doctor_bulk_create': doctor_bulk_create,
+    'mapping_bulk_create': mapping_bulk_create,
+}
+
+# Rows written by one request of each scenario, where it is more than one
+ROWS_PER_REQUEST = {'doctor_bulk_create': BULK_SIZE, 'mapping_bulk_create': BULK_SIZE}
+
+
+def run_in_process(scenario, data, indexes):
+    """Send the requests through the Django test client and return ``(latencies, errors)``"""
+    client = get_client()
+    latencies, errors = [], 0
+    for index in indexes:
+        method, path, body, authenticated = scenario(data, index)
+        headers = {'HTTP_AUTHORIZATION': f"Bearer {data.token}"} if authenticated else {}
+        start = time.perf_counter()
+        if method == 'GET':
+            response = client.get(path, **headers)
+        else:
+            response = client.generic(method, path, json.dumps(body), 'application/json', **headers)
+        latencies.append(time.perf_counter() - start)
+        errors += not 200 <= response.status_code < 300
+    return latencies, errors
+
+
+def run_over_http(scenario, data, indexes, url, concurrency):
+    """Send the requests to ``url`` over ``concurrency`` connections and return ``(latencies, errors)``"""
+    parts = urlsplit(url)
+    connection_class = HTTPSConnection if parts.scheme == 'https' else HTTPConnection
+    pending = iter(indexes)
+    lock = threading.Lock()
+    latencies, errors = [], []
+
+    def worker():
+        connection = connection_class(parts.netloc, timeout=60)
+        while True:
+            with lock:
+                index = next(pending, None)
+            if index is None:
+                break
+            method, path, body, authenticated = scenario(data, index)
+            headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+            if authenticated:
+                headers['Authorization'] = f"Bearer {data.token}"
+            start = time.perf_counter()
+            connection.request(method, parts.path.rstrip('/') + path, json.dumps(body) if body else None, headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            if not 200 <= response.status < 300:
+                errors.append(response.status)
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, len(errors)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--url', help='base URL of a running server, e.g. http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=1, help='connections, with --url')
+    parser.add_argument('--domain', default='seed.example.com')
+    parser.add_argument('--password', help='password of the seeded users (default: the seed default)')
+    parser.add_argument('--output', help='also append the results to this file')
+    args = parser.parse_args()
+
+    names = args.scenarios.split(',')
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    setup_django()
+    from healthcare_api.seed_data import SEED_PASSWORD
+
+    password = args.password or SEED_PASSWORD
+    run_id = int(time.time())
+    commit = git_commit()
+    mode = 'http' if args.url else 'in-process'
+
+    for name in names:
+        scenario = SCENARIOS[name]
+        # Separate index ranges keep created emails and license numbers unique
+        warmup = range(0, args.warmup)
+        measured = range(args.warmup, args.warmup + args.requests)
+        with nullcontext() if args.url else rolled_back():
+            data = ScenarioData(args.domain, password, run_id)
+            if args.url:
+                run_over_http(scenario, data, warmup, args.url, args.concurrency)
+                start = time.perf_counter()
+                latencies, errors = run_over_http(scenario, data, measured, args.url, args.concurrency)
+            else:
+                run_in_process(scenario, data, warmup)
+                start = time.perf_counter()
+                latencies, errors = run_in_process(scenario, data, measured)
+            elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        result = {
+            'scenario': name,
+            'mode': mode,
+            'concurrency': args.concurrency if args.url else 1,
+            'requests': len(latencies),
+            'errors': errors,
+            'req_per_s': round(len(latencies) / elapsed, 1),
+            'rows_per_s': round(len(latencies) * ROWS_PER_REQUEST.get(name, 1) / elapsed, 1),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        line = json.dumps(result)
+        print(line, flush=True)
+        if args.output:
+            with open(args.output, 'a') as output:
+                output.write(line + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Bytes and latency per request for JSON renderers and response compression.
+
+Usage: python -m benchmarks.json_compression [--mappings N] [--requests N]
+
+Requests GET /api/mappings/by_patient/ for a patient with N assigned doctors
+(each mapping nests the full patient and doctor) through the full Django
+stack, once per renderer and Accept-Encoding, then times rendering the
+same serialized list on its own. Rows are created in a transaction that is
+rolled back at the end.
+"""
+import argparse
+
+from benchmarks.common import get_bench_user, get_client, rolled_back, setup_django, time_requests
+from benchmarks.serialization import create_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mappings', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from doctors.models import Doctor
+    from mappings.models import PatientDoctorMapping
+    from mappings.serializers import PatientDoctorMappingSerializer
+    from mappings.views import PatientDoctorMappingViewSet
+    from patients.models import Patient
+    from healthcare_api.middleware import COMPRESSORS
+    from healthcare_api.renderers import ORJSONRenderer
+
+    with rolled_back():
+        create_rows(args.mappings)
+        patient = Patient.objects.order_by('-id').first()
+        doctors = Doctor.objects.order_by('-id')[:args.mappings]
+        PatientDoctorMapping.objects.bulk_create([
+            PatientDoctorMapping(patient=patient, doctor=doctor, notes='Benchmark assignment')
+            for doctor in doctors
+        ])
+
+        client = get_client(get_bench_user())
+        path = f"/api/mappings/by_patient/?patient_id={patient.pk}"
+
+        for renderer_class in (JSONRenderer, ORJSONRenderer):
+            PatientDoctorMappingViewSet.renderer_classes = [renderer_class]
+            for encoding in ('identity', *COMPRESSORS):
+                def request():
+                    return client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+
+                size = len(request().content)
+                elapsed = time_requests(request, args.requests)
+                print(
+                    f"{renderer_class.__name__:<15} {encoding:<9} "
+                    f"{size:>9} bytes  {elapsed / args.requests * 1000:7.2f} ms/request"
+                )
+
+        data = PatientDoctorMappingSerializer(patient.doctor_mappings.all(), many=True).data
+        for renderer_class in (JSONRenderer, ORJSONRenderer):
+            renderer = renderer_class()
+            elapsed = time_requests(lambda: renderer.render(data), args.requests)
+            print(f"{renderer_class.__name__:<15} render only      {elapsed / args.requests * 1000:7.2f} ms/render")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Login throughput per core for each supported password hasher.
+
+Usage: python -m benchmarks.login [--logins N] [--concurrency N]
+           [--hashers argon2,argon2-django,scrypt,pbkdf2]
+
+For each hasher a throwaway user is created in a rolled-back transaction,
+with that hasher first in PASSWORD_HASHERS so logins do not re-hash. The
+login endpoint is then called ``--logins`` times through the Django stack.
+CPU time is measured for the whole process, so ``logins/s/core`` is the
+sustained rate one fully busy core can serve.
+
+The second part checks how verification scales across the hashing pool:
+``--concurrency`` threads verify the same hash through ``password_pool``
+and the aggregate rate is compared with the number of CPUs.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+from benchmarks.common import get_client, percentile, rolled_back, setup_django
+
+PASSWORD = 'Bench-Login-Pass-1'
+
+HASHERS = {
+    'argon2': 'auth_app.hashers.Argon2PasswordHasher',
+    'argon2-django': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'auth_app.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+
+
+def time_logins(count):
+    """Log in ``count`` times and return ``(sorted latencies, cpu seconds)``"""
+    from auth_app.models import CustomUser
+
+    CustomUser.objects.create_user(email='login-bench@example.com', password=PASSWORD, name='Login Bench')
+    client = get_client()
+    body = json.dumps({'email': 'login-bench@example.com', 'password': PASSWORD})
+    latencies = []
+    cpu_start = time.process_time()
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.post('/api/auth/login/', body, 'application/json')
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"login failed with {response.status_code}: {response.content[:200]!r}")
+    return sorted(latencies), time.process_time() - cpu_start
+
+
+def time_pool(concurrency, per_thread):
+    """Verify one hash from ``concurrency`` threads through the pool and return verifications per second"""
+    from django.contrib.auth.hashers import make_password
+    from auth_app.hashers import password_pool, verify_password
+
+    encoded = make_password(PASSWORD)
+
+    def worker():
+        for _ in range(per_thread):
+            password_pool.run(verify_password, PASSWORD, encoded)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return concurrency * per_thread / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--hashers', default=','.join(HASHERS))
+    args = parser.parse_args()
+
+    names = args.hashers.split(',')
+    unknown = [name for name in names if name not in HASHERS]
+    if unknown:
+        parser.error(f"unknown hashers: {', '.join(unknown)}")
+
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+
+    pool_options = dict(settings.PASSWORD_HASHING_POOL, MAX_PENDING=args.concurrency, WAIT_TIMEOUT=60)
+    print(f"{os.cpu_count()} CPUs, {settings.PASSWORD_HASHING_POOL['WORKERS']} hashing workers")
+    for name in names:
+        hashers = [HASHERS[name]] + [path for path in HASHERS.values() if path != HASHERS[name]]
+        with override_settings(PASSWORD_HASHERS=hashers, PASSWORD_HASHING_POOL=pool_options):
+            with rolled_back():
+                time_logins(1)
+            with rolled_back():
+                latencies, cpu_seconds = time_logins(args.logins)
+            pool_rate = time_pool(args.concurrency, max(args.logins // args.concurrency, 2))
+        print(
+            f"{name:<14} p50 {percentile(latencies, 0.50) * 1000:7.1f} ms  "
+            f"cpu {cpu_seconds / len(latencies) * 1000:7.1f} ms/login  "
+            f"{len(latencies) / cpu_seconds:7.1f} logins/s/core  "
+            f"pool x{args.concurrency} {pool_rate:7.1f} verifications/s"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Per-row cost of list serialization with ModelSerializer and with values() rows.
+
+Usage: python -m benchmarks.serialization [--rows N] [--repeat N]
+
+Each variant fetches the same rows and renders them to JSON, so the numbers
+include both the ORM and the serializer cost. Missing rows are created in a
+transaction that is rolled back at the end, leaving the database unchanged.
+Both variants must render byte-identical JSON.
+"""
+import argparse
+import time
+from datetime import date
+from decimal import Decimal
+
+from benchmarks.common import rolled_back, setup_django
+
+
+def create_rows(count):
+    """Create ``count`` doctors and patients (with users) for the benchmark"""
+    from auth_app.models import CustomUser
+    from doctors.models import Doctor
+    from patients.models import Patient
+
+    users = CustomUser.objects.bulk_create([
+        CustomUser(email=f"serialization-bench-{index}@example.com", name=f"Bench {index}", password='!')
+        for index in range(count)
+    ])
+    Doctor.objects.bulk_create([
+        Doctor(
+            user=user, first_name='Bench', last_name=f"Doctor {index}", email=f"bench-doctor-{index}@example.com",
+            phone='555-0100', gender='F', specialization='CARD', license_number=f"BENCH-{index}",
+            experience_years=index % 40, consultation_fee=Decimal('120.00'), bio='Lorem ipsum ' * 20,
+            office_address='1 Bench Street'
+        )
+        for index, user in enumerate(users)
+    ])
+    Patient.objects.bulk_create([
+        Patient(
+            user=user, first_name='Bench', last_name=f"Patient {index}", email=user.email, phone='555-0101',
+            date_of_birth=date(1980, 1, 1), gender='M', blood_type='O+', address='2 Bench Road', city='City',
+            state='State', postal_code='12345', medical_history='None ' * 40, allergies='None'
+        )
+        for index, user in enumerate(users)
+    ])
+
+
+def measure(render, repeat):
+    """Return the best wall time of ``repeat`` runs and the rendered output"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = render()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+def run(rows, repeat):
+    from rest_framework.renderers import JSONRenderer
+    from doctors.models import Doctor
+    from doctors.serializers import DoctorSerializer
+    from patients.models import Patient
+    from patients.serializers import PatientSerializer
+    from healthcare_api.eager_loading import setup_eager_loading
+    from healthcare_api.representation import get_values_representation
+
+    renderer = JSONRenderer()
+    for model, serializer_class in ((Doctor, DoctorSerializer), (Patient, PatientSerializer)):
+        queryset = model.objects.order_by('-created_at', '-id')
+        representation = get_values_representation(serializer_class)
+
+        def with_serializer():
+            instances = list(setup_eager_loading(queryset, serializer_class)[:rows])
+            return renderer.render(serializer_class(instances, many=True).data)
+
+        def with_values():
+            return renderer.render(representation.represent_rows(representation.values(queryset)[:rows]))
+
+        before, expected = measure(with_serializer, repeat)
+        after, actual = measure(with_values, repeat)
+        count = min(rows, queryset.count())
+        print(
+            f"{serializer_class.__name__:<18} {count} rows  "
+            f"ModelSerializer {before / count * 1e6:7.1f} us/row  "
+            f"values() {after / count * 1e6:7.1f} us/row  "
+            f"speedup {before / after:4.1f}x  identical={expected == actual}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from doctors.models import Doctor
+    from patients.models import Patient
+
+    with rolled_back():
+        missing = args.rows - min(Doctor.objects.count(), Patient.objects.count())
+        if missing > 0:
+            create_rows(missing)
+        run(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Gunicorn configuration serving the API under ASGI with uvicorn workers.
+
+Usage: gunicorn -c deploy/gunicorn_asgi.conf.py
+
+Each worker runs one event loop, so the async read views (ASYNC_READ_VIEWS)
+keep serving other requests while one waits on PostgreSQL or the cache;
+the remaining sync views run in the worker's thread pool. Persistent
+connections are off by default because Django opens one per thread under
+ASGI; put PgBouncer in front of PostgreSQL to pool them instead.
+Workers write their request metrics to METRICS_MULTIPROCESS_DIR, emptied
+when the server starts, so /metrics reports all of them.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+os.environ.setdefault('METRICS_MULTIPROCESS_DIR', os.path.join(tempfile.gettempdir(), 'healthcare_api_metrics'))
+
+wsgi_app = 'healthcare_api.asgi:application'
+worker_class = 'uvicorn.workers.UvicornWorker'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+
+def on_starting(server):
+    # Counters restart from zero with the server, so drop the previous run's files
+    shutil.rmtree(os.environ['METRICS_MULTIPROCESS_DIR'], ignore_errors=True)
@@ -8,7 +8,9 @@ class DoctorAdmin(admin.ModelAdmin):
     list_filter = ('specialization', 'gender', 'is_active', 'created_at')
     search_fields = ('first_name', 'last_name', 'email', 'license_number', 'specialization')
     ordering = ('-created_at',)
-    readonly_fields = ('user', 'created_at', 'updated_at')
+    readonly_fields = (
+        'user', 'active_mapping_count', 'inactive_mapping_count', 'suspended_mapping_count', 'created_at', 'updated_at'
+    )
     
     fieldsets = (
         ('User', {'fields': ('user',)}),
@@ -21,6 +23,9 @@ class DoctorAdmin(admin.ModelAdmin):
         ('Office Details', {
             'fields': ('office_address', 'office_phone', 'available_days', 'available_hours')
         }),
+        ('Caseload', {
+            'fields': ('active_mapping_count', 'inactive_mapping_count', 'suspended_mapping_count')
+        }),
         ('Status', {
             'fields': ('is_active', 'created_at', 'updated_at')
         }),
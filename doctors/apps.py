@@ -5,3 +5,7 @@ class DoctorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'doctors'
     verbose_name = 'Doctors'
+    
+    def ready(self):
+        import doctors.checks  # noqa: F401
+        import doctors.signals  # noqa: F401
@@ -0,0 +1,58 @@
+from rest_framework import status
+from rest_framework.response import Response
+from doctors.cache import acache_response
+from doctors.views import DoctorViewSet
+from healthcare_api.async_views import AsyncReadView
+
+
+class AsyncDoctorListView(AsyncReadView):
+    """Async version of ``DoctorViewSet.list``"""
+    
+    view_class = DoctorViewSet
+    action = 'list'
+    
+    @acache_response('list')
+    async def read(self, request, *args, **kwargs):
+        view = self.view
+        queryset = view.filter_queryset(view.get_queryset())
+        rows = view.get_values_queryset(queryset)
+        page = await view.paginator.apaginate_queryset(rows, request, view=view)
+        rows = page if page is not None else [row async for row in rows]
+        count = view.paginator.count if page is not None else len(rows)
+        validators = view.get_list_validators(rows, count)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        data = view.represent_rows(rows)
+        if page is not None:
+            return validators.apply(view.get_paginated_response({
+                'count': count,
+                'doctors': data
+            }))
+        
+        return validators.apply(Response(
+            {
+                'count': count,
+                'doctors': data
+            },
+            status=status.HTTP_200_OK
+        ))
+
+
+class AsyncDoctorDetailView(AsyncReadView):
+    """Async version of ``DoctorViewSet.retrieve``"""
+    
+    view_class = DoctorViewSet
+    action = 'retrieve'
+    
+    @acache_response('retrieve')
+    async def read(self, request, *args, **kwargs):
+        view = self.view
+        instance = await self.aget_object()
+        validators = view.get_object_validators(instance)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        return validators.apply(Response(view.represent_object(instance), status=status.HTTP_200_OK))
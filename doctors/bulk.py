@@ -0,0 +1,104 @@
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from doctors.cache import doctor_cache
+from doctors.models import Doctor
+from doctors.serializers import DoctorCreateUpdateSerializer
+from healthcare_api.bulk import BulkResult, bulk_create_checked, get_bulk_instances, validate_bulk_items
+from healthcare_api.search import refresh_search_documents
+
+UNIQUE_FIELD_MESSAGES = {
+    'email': "A doctor with this email already exists.",
+    'license_number': "A doctor with this license number already exists.",
+}
+
+
+def check_unique_fields(valid, result, instances=None):
+    """Reject items whose email or license number is reused, with one query for the batch"""
+    instances = instances or {}
+    claimed = {field: {} for field in UNIQUE_FIELD_MESSAGES}
+    for index, data in valid:
+        for field, message in UNIQUE_FIELD_MESSAGES.items():
+            value = data.get(field)
+            if value is None:
+                continue
+            if value in claimed[field]:
+                result.error(index, {field: [message]})
+            else:
+                claimed[field][value] = index
+    
+    condition = Q(email__in=list(claimed['email'])) | Q(license_number__in=list(claimed['license_number']))
+    for pk, email, license_number in Doctor.objects.filter(condition).order_by().values_list('pk', 'email', 'license_number'):
+        for field, value in (('email', email), ('license_number', license_number)):
+            index = claimed[field].get(value)
+            if index is None:
+                continue
+            instance = instances.get(index)
+            if instance is None or instance.pk != pk:
+                result.error(index, {field: [UNIQUE_FIELD_MESSAGES[field]]})
+    
+    return [(index, data) for index, data in valid if not result.is_error(index)]
+
+
+def refresh_created_search_documents(rows):
+    """Fill in the search documents of inserted ``(index, doctor)`` rows with one UPDATE"""
+    # Far cheaper than compiling a search document expression into every row of the INSERT
+    refresh_search_documents(Doctor.objects.filter(pk__in=[doctor.pk for _, doctor in rows]))
+
+
+def bulk_create_doctors(items, context):
+    """Validate and insert many doctors in one transaction"""
+    result = BulkResult(len(items))
+    valid = validate_bulk_items(DoctorCreateUpdateSerializer, items, result, context)
+    valid = check_unique_fields(valid, result)
+    
+    doctors = bulk_create_checked(
+        Doctor, valid, lambda data: Doctor(**data), partial(check_unique_fields, result=result), result,
+        {'non_field_errors': ["A doctor with this email or license number already exists."]},
+        on_created=refresh_created_search_documents
+    )
+    if doctors:
+        transaction.on_commit(doctor_cache.invalidate)
+    
+    for index, doctor in doctors:
+        result.success(index, 'created', doctor.pk)
+    return result
+
+
+def bulk_update_doctors(items, context):
+    """Validate and apply partial updates to many doctors in one transaction"""
+    result = BulkResult(len(items))
+    instances = get_bulk_instances(Doctor, items, result)
+    valid = validate_bulk_items(DoctorCreateUpdateSerializer, items, result, context, instances=instances)
+    valid = check_unique_fields(valid, result, instances)
+    
+    now = timezone.now()
+    searchable = {field for field, _ in Doctor.SEARCH_DOCUMENT_FIELDS}
+    # Each row writes only the fields its own item supplied, so concurrent edits to the others survive
+    groups = defaultdict(list)
+    doctors = []
+    for index, data in valid:
+        doctor = instances[index]
+        for field, value in data.items():
+            setattr(doctor, field, value)
+        doctor.updated_at = now
+        groups[tuple(sorted(data))].append(doctor)
+        doctors.append((index, doctor))
+    
+    if doctors:
+        with transaction.atomic():
+            for fields, rows in groups.items():
+                Doctor.objects.bulk_update(rows, fields=[*fields, 'updated_at'], batch_size=settings.BULK_CHUNK_SIZE)
+            # Rebuilt from the stored columns rather than the loaded instances, which may be stale
+            reindexed = [doctor.pk for fields, rows in groups.items() if searchable & set(fields) for doctor in rows]
+            if reindexed:
+                refresh_search_documents(Doctor.objects.filter(pk__in=reindexed))
+        transaction.on_commit(doctor_cache.invalidate)
+    
+    for index, doctor in doctors:
+        result.success(index, 'updated', doctor.pk)
+    return result
@@ -0,0 +1,162 @@
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class DoctorResponseCache:
+    """Cache of doctor directory responses, invalidated with a generation counter.
+    
+    Every key embeds the current generation, so bumping the counter on a write
+    makes all previously cached responses unreachable at once; they then age
+    out of the cache backend on their own. Hit and miss counters are kept in
+    the same cache so they are shared between workers when it is.
+    """
+    
+    key_prefix = 'doctors'
+    
+    @property
+    def cache(self):
+        return caches[settings.DOCTOR_RESPONSE_CACHE['CACHE_ALIAS']]
+    
+    def _incr(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, 0, None)
+            return self.cache.incr(key)
+    
+    async def _aincr(self, key):
+        try:
+            return await self.cache.aincr(key)
+        except ValueError:
+            await self.cache.aadd(key, 0, None)
+            return await self.cache.aincr(key)
+    
+    def generation(self):
+        """Return the current cache generation"""
+        key = f"{self.key_prefix}:generation"
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, 1, None)
+            generation = self.cache.get(key, 1)
+        return generation
+    
+    async def ageneration(self):
+        key = f"{self.key_prefix}:generation"
+        generation = await self.cache.aget(key)
+        if generation is None:
+            await self.cache.aadd(key, 1, None)
+            generation = await self.cache.aget(key, 1)
+        return generation
+    
+    def invalidate(self):
+        """Start a new generation, orphaning every cached response"""
+        self._incr(f"{self.key_prefix}:generation")
+    
+    def _request_digest(self, request, action, view_kwargs):
+        params = urlencode(sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        ))
+        raw = '|'.join([
+            request.scheme, request.get_host(), action,
+            urlencode(sorted(view_kwargs.items())), params,
+        ])
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()
+    
+    def make_key(self, request, action, view_kwargs):
+        """Build a key from the action, URL kwargs and normalized query parameters"""
+        return f"{self.key_prefix}:{self.generation()}:{self._request_digest(request, action, view_kwargs)}"
+    
+    async def amake_key(self, request, action, view_kwargs):
+        return f"{self.key_prefix}:{await self.ageneration()}:{self._request_digest(request, action, view_kwargs)}"
+    
+    def get(self, key):
+        """Return cached response data for ``key`` and record a hit or miss"""
+        data = self.cache.get(key)
+        self._incr(f"{self.key_prefix}:{'hits' if data is not None else 'misses'}")
+        return data
+    
+    async def aget(self, key):
+        data = await self.cache.aget(key)
+        await self._aincr(f"{self.key_prefix}:{'hits' if data is not None else 'misses'}")
+        return data
+    
+    def set(self, key, data):
+        self.cache.set(key, data, settings.DOCTOR_RESPONSE_CACHE['TIMEOUT'])
+    
+    async def aset(self, key, data):
+        await self.cache.aset(key, data, settings.DOCTOR_RESPONSE_CACHE['TIMEOUT'])
+    
+    def stats(self):
+        """Return hit/miss counters and the current generation"""
+        counters = self.cache.get_many([f"{self.key_prefix}:hits", f"{self.key_prefix}:misses"])
+        hits = counters.get(f"{self.key_prefix}:hits", 0)
+        misses = counters.get(f"{self.key_prefix}:misses", 0)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+            'generation': self.generation(),
+        }
+
+
+doctor_cache = DoctorResponseCache()
+
+
+def _cached_response(request, cached):
+    data, validators = cached
+    if validators is None:
+        return Response(data, status=status.HTTP_200_OK)
+    not_modified = validators.get_not_modified_response(request)
+    if not_modified is not None:
+        return not_modified
+    return validators.apply(Response(data, status=status.HTTP_200_OK))
+
+
+def cache_response(action):
+    """Serve a viewset method's 200 responses, and their validators, from ``doctor_cache``"""
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not settings.DOCTOR_RESPONSE_CACHE['ENABLED']:
+                return view_method(self, request, *args, **kwargs)
+            
+            key = doctor_cache.make_key(request, action, kwargs)
+            cached = doctor_cache.get(key)
+            if cached is not None:
+                return _cached_response(request, cached)
+            
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                doctor_cache.set(key, (response.data, getattr(response, 'validators', None)))
+            return response
+        return wrapper
+    return decorator
+
+
+def acache_response(action):
+    """Async version of :func:`cache_response`, sharing its cache entries"""
+    def decorator(view_method):
+        @wraps(view_method)
+        async def wrapper(self, request, *args, **kwargs):
+            if not settings.DOCTOR_RESPONSE_CACHE['ENABLED']:
+                return await view_method(self, request, *args, **kwargs)
+            
+            key = await doctor_cache.amake_key(request, action, kwargs)
+            cached = await doctor_cache.aget(key)
+            if cached is not None:
+                return _cached_response(request, cached)
+            
+            response = await view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                await doctor_cache.aset(key, (response.data, getattr(response, 'validators', None)))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_doctor_response_cache(app_configs, **kwargs):
+    """Warn when the doctor response cache is enabled on a cache each process keeps to itself"""
+    options = settings.DOCTOR_RESPONSE_CACHE
+    backend = settings.CACHES[options['CACHE_ALIAS']]['BACKEND']
+    if options['ENABLED'] and backend == 'django.core.cache.backends.locmem.LocMemCache':
+        return [Warning(
+            'DOCTOR_RESPONSE_CACHE is enabled on a per-process LocMemCache.',
+            hint=(
+                'Invalidations only reach the process that made the write, so other workers serve '
+                'stale doctor responses until they expire. Set REDIS_URL, or disable the cache.'
+            ),
+            id='doctors.W001',
+        )]
+    return []
@@ -0,0 +1,15 @@
+from django_filters import rest_framework as filters
+from doctors.models import Doctor
+
+
+class DoctorFilter(filters.FilterSet):
+    """Filter set for Doctor list queries"""
+    
+    class Meta:
+        model = Doctor
+        fields = {
+            'specialization': ['exact'],
+            'is_active': ['exact'],
+            'experience_years': ['exact', 'gte', 'lte'],
+            'consultation_fee': ['exact', 'gte', 'lte'],
+        }
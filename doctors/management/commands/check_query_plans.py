@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from auth_app.models import CustomUser
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from healthcare_api.query_plans import (
+    NoPlanData, explain, get_plan_queries, plan_indexes, refresh_statistics, sequential_scans
+)
+
+
+class Command(BaseCommand):
+    """EXPLAIN the queries behind the main API reads and fail if any scans a table sequentially"""
+    
+    help = (
+        'Run EXPLAIN for the list, filter, search, lookup and change feed queries of the viewsets, '
+        'built by the viewsets themselves, and exit with an error when a plan reads one of their '
+        'tables with a sequential scan. Run it against seeded data (manage.py seed_healthcare); '
+        'on near-empty tables PostgreSQL rightly prefers sequential scans.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--no-analyze', action='store_true', help='skip ANALYZE and GIN pending list cleanup on the tables first')
+        parser.add_argument(
+            '--min-rows', type=int, default=1000,
+            help='allow sequential scans of tables with fewer rows, where they are the cheaper plan'
+        )
+    
+    def handle(self, *args, **options):
+        tables = [model._meta.db_table for model in (CustomUser, Doctor, Patient, PatientDoctorMapping)]
+        if not options['no_analyze']:
+            refresh_statistics(tables)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s)', [tables])
+            rows = dict(cursor.fetchall())
+        checked = [table for table in tables if rows.get(table, 0) >= options['min_rows']]
+        
+        try:
+            queries = list(get_plan_queries())
+        except NoPlanData as exc:
+            raise CommandError(str(exc))
+        
+        failures = []
+        for name, statements in queries:
+            plans = [explain(sql) for sql in statements]
+            scanned = sorted({table for plan in plans for table in sequential_scans(plan, checked)})
+            indexes = sorted({index for plan in plans for index in plan_indexes(plan)})
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"SEQ SCAN  {name}: {', '.join(scanned)}"))
+                for sql, plan in zip(statements, plans):
+                    if sequential_scans(plan, checked):
+                        self.stdout.write(f"{sql}\n{plan}")
+            else:
+                self.stdout.write(f"ok        {name}: {', '.join(indexes) or 'sequential scan of a small table'}")
+        
+        if failures:
+            raise CommandError(f"{len(failures)} queries scan a table sequentially")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from doctors.models import Doctor
+from patients.models import Patient
+from healthcare_api.search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    """Recompute the stored full-text search documents for doctors and patients"""
+    
+    help = 'Rebuild the search_document column on Doctor and Patient in primary key batches.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in (Doctor, Patient):
+            updated = 0
+            last_pk = 0
+            while True:
+                pks = list(
+                    model.objects.filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not pks:
+                    break
+                with transaction.atomic():
+                    updated += refresh_search_documents(model.objects.filter(pk__in=pks))
+                last_pk = pks[-1]
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {updated} search documents rebuilt")
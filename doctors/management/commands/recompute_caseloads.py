@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from doctors.models import Doctor
+from patients.models import Patient
+from healthcare_api.caseload import recompute_caseloads
+
+
+class Command(BaseCommand):
+    """Recount the caseload counters of doctors and patients from their mappings"""
+    
+    help = (
+        'Recompute active/inactive/suspended mapping counts on Doctor and Patient in primary key '
+        'batches, rewriting only the rows whose counters have drifted.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in (Doctor, Patient):
+            repaired = 0
+            last_pk = 0
+            while True:
+                pks = list(
+                    model.objects.filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not pks:
+                    break
+                with transaction.atomic():
+                    repaired += recompute_caseloads(model.objects.filter(pk__in=pks))
+                last_pk = pks[-1]
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {repaired} caseload counters repaired")
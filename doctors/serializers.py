@@ -1,14 +1,15 @@
 from rest_framework import serializers
 from doctors.models import Doctor
 from auth_app.serializers import CustomUserSerializer
+from healthcare_api.bulk import strip_unique_validators
 
 
 class DoctorSerializer(serializers.ModelSerializer):
     """Serializer for Doctor model"""
     
     user = CustomUserSerializer(read_only=True)
-    get_specialization_display = serializers.CharField(source='get_specialization_display', read_only=True)
-    get_gender_display = serializers.CharField(source='get_gender_display', read_only=True)
+    get_specialization_display = serializers.CharField(read_only=True)
+    get_gender_display = serializers.CharField(read_only=True)
     
     class Meta:
         model = Doctor
@@ -18,10 +19,18 @@ class DoctorSerializer(serializers.ModelSerializer):
             'license_number', 'hospital_affiliation', 'experience_years',
             'consultation_fee', 'bio', 'office_address', 'office_phone',
             'available_days', 'available_hours', 'is_active',
+            'active_mapping_count', 'inactive_mapping_count', 'suspended_mapping_count',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
     
+    def get_fields(self):
+        """Leave uniqueness to a set-based check when validating in bulk"""
+        fields = super().get_fields()
+        if self.context.get('bulk'):
+            strip_unique_validators(fields, ['email', 'license_number'])
+        return fields
+    
     def validate_phone(self, value):
         """Validate phone number format"""
         if not value.replace('-', '').replace('+', '').isdigit():
@@ -30,6 +39,8 @@ class DoctorSerializer(serializers.ModelSerializer):
     
     def validate_email(self, value):
         """Validate email is unique (except when updating)"""
+        if self.context.get('bulk'):
+            return value
         if self.instance is None:
             if Doctor.objects.filter(email=value).exists():
                 raise serializers.ValidationError("A doctor with this email already exists.")
@@ -40,6 +51,8 @@ class DoctorSerializer(serializers.ModelSerializer):
     
     def validate_license_number(self, value):
         """Validate license number is unique"""
+        if self.context.get('bulk'):
+            return value
         if self.instance is None:
             if Doctor.objects.filter(license_number=value).exists():
                 raise serializers.ValidationError("A doctor with this license number already exists.")
@@ -54,3 +67,16 @@ class DoctorCreateUpdateSerializer(DoctorSerializer):
     
     class Meta(DoctorSerializer.Meta):
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class DoctorRegistrationSerializer(DoctorCreateUpdateSerializer):
+    """Doctor profile created along with its account; uniqueness is left to the database constraints"""
+    
+    def get_fields(self):
+        return strip_unique_validators(super().get_fields(), ['email', 'license_number'])
+    
+    def validate_email(self, value):
+        return value
+    
+    def validate_license_number(self, value):
+        return value
@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from doctors.cache import doctor_cache
+from doctors.models import Doctor
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Doctor)
+@receiver(post_delete, sender=Doctor)
+def invalidate_doctor_responses(sender, instance, **kwargs):
+    """Drop cached doctor responses once a doctor change commits"""
+    # Invalidating before the commit would let a concurrent read cache the old row in the new generation
+    transaction.on_commit(doctor_cache.invalidate)
+
+
+@receiver(post_save, sender=User)
+def invalidate_doctor_responses_for_user(sender, instance, created, update_fields=None, **kwargs):
+    """Drop cached doctor responses when a doctor's nested user changes"""
+    # A new user has no doctor yet, and passwords are not part of any response
+    if created or (update_fields is not None and set(update_fields) <= {'password', 'last_login'}):
+        return
+    if Doctor.objects.filter(user_id=instance.pk).exists():
+        transaction.on_commit(doctor_cache.invalidate)
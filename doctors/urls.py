@@ -1,4 +1,5 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from doctors.views import DoctorViewSet
 
@@ -10,3 +11,17 @@ router.register(r'', DoctorViewSet, basename='doctor')
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    from doctors.async_views import AsyncDoctorListView, AsyncDoctorDetailView
+    
+    urlpatterns = [
+        path('', AsyncDoctorListView.as_view(
+            fallback=DoctorViewSet.as_view({'get': 'list', 'post': 'create'})
+        ), name='doctor-list'),
+        re_path(r'^(?P<pk>[0-9]+)/$', AsyncDoctorDetailView.as_view(
+            fallback=DoctorViewSet.as_view({
+                'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'
+            })
+        ), name='doctor-detail'),
+    ] + urlpatterns
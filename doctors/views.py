@@ -3,18 +3,34 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from doctors.models import Doctor
 from doctors.serializers import DoctorSerializer, DoctorCreateUpdateSerializer
+from doctors.filters import DoctorFilter
+from doctors.cache import cache_response, doctor_cache
+from doctors.bulk import bulk_create_doctors, bulk_update_doctors
+from healthcare_api.bulk import get_bulk_items
+from healthcare_api.conditional import ConditionalGetMixin
+from healthcare_api.export import ExportMixin
+from healthcare_api.representation import ValuesRepresentationMixin
+from healthcare_api.eager_loading import EagerLoadingMixin
+from sync.mixins import ChangeFeedMixin
 
 
-class DoctorViewSet(viewsets.ModelViewSet):
+class DoctorViewSet(
+    EagerLoadingMixin, ConditionalGetMixin, ChangeFeedMixin, ExportMixin, ValuesRepresentationMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet for Doctor CRUD operations"""
     
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'user__updated_at']
+    change_feed_key = 'doctors'
     serializer_class = DoctorSerializer
     queryset = Doctor.objects.all()
-    filterset_fields = ['specialization', 'is_active']
+    filterset_class = DoctorFilter
     search_fields = ['first_name', 'last_name', 'email', 'specialization']
+    search_document_fields = ['search_document']
     ordering_fields = ['first_name', 'last_name', 'experience_years', 'created_at']
     ordering = ['-created_at']
+    keyset_ordering = ['-created_at', '-id']
     
     def get_serializer_class(self):
         """Use different serializer for different actions"""
@@ -35,31 +51,44 @@ class DoctorViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
     
+    @cache_response('list')
     def list(self, request, *args, **kwargs):
         """List all doctors"""
         queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
+        rows = self.get_values_queryset(queryset)
+        page = self.paginate_queryset(rows)
+        rows = page if page is not None else list(rows)
+        count = self.paginator.count if page is not None else len(rows)
+        validators = self.get_list_validators(rows, count)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        data = self.represent_rows(rows)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response({
-                'count': self.paginator.count,
-                'doctors': serializer.data
-            })
+            return validators.apply(self.get_paginated_response({
+                'count': count,
+                'doctors': data
+            }))
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
+        return validators.apply(Response(
             {
-                'count': len(serializer.data),
-                'doctors': serializer.data
+                'count': count,
+                'doctors': data
             },
             status=status.HTTP_200_OK
-        )
+        ))
     
+    @cache_response('retrieve')
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a specific doctor"""
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        validators = self.get_object_validators(instance)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        return validators.apply(Response(self.represent_object(instance), status=status.HTTP_200_OK))
     
     def update(self, request, *args, **kwargs):
         """Update a doctor (full update)"""
@@ -106,3 +135,17 @@ class DoctorViewSet(viewsets.ModelViewSet):
             for choice in Doctor.SPECIALIZATION_CHOICES
         ]
         return Response(specializations, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """Create (POST) or partially update (PATCH) many doctors in one transaction"""
+        items = get_bulk_items(request)
+        context = self.get_serializer_context()
+        if request.method == 'POST':
+            return bulk_create_doctors(items, context).to_response(status.HTTP_201_CREATED)
+        return bulk_update_doctors(items, context).to_response()
+    
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def cache_stats(self, request):
+        """Get response cache hit/miss counters"""
+        return Response(doctor_cache.stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,107 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.http import Http404
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.viewsets import ViewSetMixin
+
+
+class AsyncReadView(View):
+    """Async GET/HEAD endpoint that borrows its behaviour from a DRF view.
+
+    DRF views are synchronous, so under ASGI each request to one holds a
+    worker thread for its whole duration, including every database round
+    trip. This view runs :meth:`read` on the event loop instead, awaiting
+    the async ORM, while an instance of ``view_class`` still supplies
+    authentication, permissions, content negotiation, filtering,
+    pagination, error handling and response finalization.
+
+    Only JSON reads take the async path. Other methods and other renderers
+    (such as the browsable API) are passed to ``fallback``, the regular
+    DRF view for the same URL, run in a worker thread.
+    """
+
+    view_class = None
+    action = None
+    fallback = None
+    view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        if cls.view_class is None or initkwargs.get('fallback', cls.fallback) is None:
+            raise ImproperlyConfigured(f"{cls.__name__} requires view_class and fallback")
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await self.get(request, *args, **kwargs)
+        return await self.run_fallback(request, *args, **kwargs)
+
+    async def run_fallback(self, request, *args, **kwargs):
+        return await sync_to_async(self.fallback)(request, *args, **kwargs)
+
+    def initialize_view(self, request, args, kwargs):
+        """Return a ``view_class`` instance set up as DRF's ``as_view`` would for this request"""
+        view = self.view_class()
+        if isinstance(view, ViewSetMixin):
+            view.action_map = {'get': self.action, 'head': self.action}
+        view.args = args
+        view.kwargs = kwargs
+        view.format_kwarg = view.get_format_suffix(**kwargs)
+        view.headers = view.default_response_headers
+        view.request = view.initialize_request(request, *args, **kwargs)
+        return view
+
+    async def authenticate(self, request):
+        """Authenticate a DRF request, awaiting ``aauthenticate`` where an authenticator has one"""
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def get(self, request, *args, **kwargs):
+        self.view = view = self.initialize_view(request, args, kwargs)
+        drf_request = view.request
+        try:
+            renderer, media_type = view.perform_content_negotiation(drf_request)
+            if renderer.format != 'json':
+                return await self.run_fallback(request, *args, **kwargs)
+            drf_request.accepted_renderer, drf_request.accepted_media_type = renderer, media_type
+
+            await self.authenticate(drf_request)
+            view.check_permissions(drf_request)
+            view.check_throttles(drf_request)
+            response = await self.read(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+        return view.finalize_response(drf_request, response, *args, **kwargs)
+
+    async def read(self, request, *args, **kwargs):
+        """Return the DRF ``Response`` for an authenticated, permitted request; ``self.view`` is set"""
+        raise NotImplementedError('Subclasses must implement read()')
+
+    async def aget_object(self):
+        """Async version of ``GenericAPIView.get_object``"""
+        view = self.view
+        queryset = view.filter_queryset(view.get_queryset())
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            instance = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        view.check_object_permissions(view.request, instance)
+        return instance
@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+# SQLSTATEs of the constraint violations a concurrent write can cause between check and insert
+UNIQUE_VIOLATION = '23505'
+FOREIGN_KEY_VIOLATION = '23503'
+
+
+def strip_unique_validators(fields, field_names):
+    """Remove per-row ``UniqueValidator`` queries from serializer fields validated in bulk"""
+    for name in field_names:
+        if name in fields:
+            fields[name].validators = [
+                validator for validator in fields[name].validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+    return fields
+
+
+def get_bulk_items(request):
+    """Return the request body as a list of items, enforcing ``BULK_MAX_ITEMS``"""
+    items = request.data
+    if not isinstance(items, list):
+        raise serializers.ValidationError({'non_field_errors': ['Expected a list of items.']})
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise serializers.ValidationError({
+            'non_field_errors': [f"A bulk request may contain at most {settings.BULK_MAX_ITEMS} items."]
+        })
+    return items
+
+
+class BulkResult:
+    """Per-item outcome of a bulk request, in request order"""
+    
+    def __init__(self, size):
+        self.items = [None] * size
+    
+    def error(self, index, errors):
+        self.items[index] = {'index': index, 'status': 'error', 'errors': errors}
+    
+    def success(self, index, outcome, pk):
+        self.items[index] = {'index': index, 'status': outcome, 'id': pk}
+    
+    def is_error(self, index):
+        item = self.items[index]
+        return item is not None and item['status'] == 'error'
+    
+    def to_response(self, success_status=status.HTTP_200_OK):
+        """Return 2xx when every item succeeded, 400 when none did and 207 otherwise"""
+        failed = sum(1 for item in self.items if item['status'] == 'error')
+        if not failed:
+            response_status = success_status
+        elif failed == len(self.items):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response(
+            {
+                'succeeded': len(self.items) - failed,
+                'failed': failed,
+                'results': self.items
+            },
+            status=response_status
+        )
+
+
+def validate_bulk_items(serializer_class, items, result, context, instances=None):
+    """Run field-level validation for every item without per-row database checks.
+    
+    ``instances`` maps item index to the instance being partially updated.
+    Returns ``(index, validated_data)`` pairs for the items that passed.
+    """
+    context = {**context, 'bulk': True}
+    # New items share one serializer, so its fields are built once per batch
+    shared = serializer_class(data={}, context=context) if instances is None else None
+    valid = []
+    for index, item in enumerate(items):
+        if shared is not None:
+            try:
+                valid.append((index, shared.run_validation(item)))
+            except serializers.ValidationError as exc:
+                result.error(index, serializers.as_serializer_error(exc))
+            continue
+        if index not in instances:
+            continue
+        serializer = serializer_class(instances[index], data=item, partial=True, context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            result.error(index, serializer.errors)
+    return valid
+
+
+def get_bulk_instances(model, items, result):
+    """Load the instances named by each item's ``id`` in one query"""
+    ids = {}
+    for index, item in enumerate(items):
+        pk = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(pk, int):
+            result.error(index, {'id': ['This field is required.']})
+        elif pk in ids.values():
+            result.error(index, {'id': [f"Object with id {pk} appears more than once."]})
+        else:
+            ids[index] = pk
+    
+    found = model._default_manager.in_bulk(set(ids.values()))
+    instances = {}
+    for index, pk in ids.items():
+        if pk in found:
+            instances[index] = found[pk]
+        else:
+            result.error(index, {'id': [f"Object with id {pk} does not exist."]})
+    return instances
+
+
+def bulk_create_checked(model, valid, build, recheck, result, conflict_errors, on_created=None):
+    """Insert ``build(data)`` for each valid item in one transaction and return the ``(index, instance)`` pairs.
+    
+    Uniqueness and references are checked for the whole batch before the
+    insert, so a concurrent request committing a conflicting row in between
+    makes ``bulk_create`` fail as a whole. ``recheck(valid)`` then runs again,
+    now seeing that row, to reject the items that lost the race, and the rest
+    are inserted; if that fails as well, the remaining items get
+    ``conflict_errors``. ``on_created(rows)`` runs in the same transaction.
+    """
+    for attempt in range(2):
+        rows = [(index, build(data)) for index, data in valid]
+        if not rows:
+            return []
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_create(
+                    [instance for _, instance in rows], batch_size=settings.BULK_CHUNK_SIZE
+                )
+                if on_created is not None:
+                    on_created(rows)
+            return rows
+        except IntegrityError as exc:
+            if getattr(exc.__cause__, 'pgcode', None) not in (UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION):
+                raise
+            if attempt == 0:
+                valid = recheck(valid)
+    
+    for index, _ in valid:
+        result.error(index, conflict_errors)
+    return []
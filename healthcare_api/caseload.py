@@ -0,0 +1,102 @@
+from collections import Counter, defaultdict
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+# Mapping status -> the counter column on Doctor and Patient that counts it
+CASELOAD_FIELDS = {
+    'ACTIVE': 'active_mapping_count',
+    'INACTIVE': 'inactive_mapping_count',
+    'SUSPENDED': 'suspended_mapping_count',
+}
+
+
+def caseload_update_fields(instance):
+    """Return the fields a full ``save()`` of a loaded row should write: all but the counters.
+
+    Counters only change through ``UPDATE ... SET n = n + 1``; writing back
+    the values loaded with the instance would undo concurrent assignments.
+    """
+    deferred = instance.get_deferred_fields()
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in CASELOAD_FIELDS.values() and field.attname not in deferred
+    ]
+
+
+def apply_caseload_changes(changes):
+    """Add each ``(patient_id, doctor_id, status, delta)`` in ``changes`` to the counters.
+
+    Runs in the caller's transaction, so the counters commit or roll back
+    with the mapping writes; cached doctor responses are dropped once that
+    transaction commits. Rows with the same net change share an UPDATE,
+    and rows are locked in primary key order so concurrent bulk writes
+    cannot deadlock on them.
+    """
+    from doctors.cache import doctor_cache
+    from doctors.models import Doctor
+    from patients.models import Patient
+
+    deltas = {Patient: defaultdict(Counter), Doctor: defaultdict(Counter)}
+    for patient_id, doctor_id, status, delta in changes:
+        field = CASELOAD_FIELDS[status]
+        deltas[Patient][patient_id][field] += delta
+        deltas[Doctor][doctor_id][field] += delta
+
+    now = timezone.now()
+    doctors_changed = False
+    with transaction.atomic(savepoint=False):
+        for model, rows in deltas.items():
+            groups = defaultdict(list)
+            for pk, counts in rows.items():
+                change = tuple(sorted((field, delta) for field, delta in counts.items() if delta))
+                if change:
+                    groups[change].append(pk)
+            if not groups:
+                continue
+            if len(rows) > 1:
+                list(model.objects.filter(pk__in=list(rows)).order_by('pk').select_for_update().values_list('pk'))
+            for change, pks in groups.items():
+                model.objects.filter(pk__in=pks).update(
+                    updated_at=now,
+                    **{field: Greatest(F(field) + delta, Value(0)) for field, delta in change}
+                )
+            doctors_changed = doctors_changed or model is Doctor
+    if doctors_changed:
+        # After the commit, so a concurrent read cannot cache the old counters in the new generation
+        transaction.on_commit(doctor_cache.invalidate)
+
+
+def caseload_expressions(model):
+    """Return ``{counter: subquery}`` counting the mappings of each row of ``model`` by status"""
+    from mappings.models import PatientDoctorMapping
+
+    key = next(
+        field.name for field in PatientDoctorMapping._meta.concrete_fields if field.related_model is model
+    )
+    return {
+        field: Coalesce(
+            Subquery(
+                PatientDoctorMapping.objects.filter(**{key: OuterRef('pk')}, status=status)
+                .order_by().values(key).annotate(total=Count('pk')).values('total')
+            ),
+            0,
+            output_field=IntegerField()
+        )
+        for status, field in CASELOAD_FIELDS.items()
+    }
+
+
+def recompute_caseloads(queryset):
+    """Recount the counters of the rows in ``queryset`` that disagree with their mappings; return how many"""
+    counts = caseload_expressions(queryset.model)
+    drifted = reduce(lambda left, right: left | right, (~Q(**{field: count}) for field, count in counts.items()))
+    updated = queryset.filter(drifted).update(updated_at=timezone.now(), **counts)
+    if updated and queryset.model._meta.label == 'doctors.Doctor':
+        from doctors.cache import doctor_cache
+
+        transaction.on_commit(doctor_cache.invalidate)
+    return updated
@@ -0,0 +1,104 @@
+import hashlib
+from datetime import datetime
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+class Validators:
+    """An ETag and optional Last-Modified timestamp describing a representation"""
+
+    def __init__(self, etag, last_modified=None, use_last_modified=True):
+        self.etag = quote_etag(etag)
+        self.last_modified = last_modified
+        self.use_last_modified = use_last_modified
+
+    def get_not_modified_response(self, request):
+        """Return a 304 response if the request's preconditions match, else ``None``"""
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        last_modified = self.last_modified if self.use_last_modified else None
+        response = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        """Set the ETag and Last-Modified headers on ``response``"""
+        response['ETag'] = self.etag
+        if self.last_modified is not None:
+            response['Last-Modified'] = http_date(self.last_modified.timestamp())
+        response.validators = self
+        return response
+
+
+def _digest(*parts):
+    return hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def _representation_key(request):
+    renderer = getattr(request, 'accepted_renderer', None)
+    user_id = getattr(getattr(request, 'user', None), 'pk', None)
+    return request.get_full_path(), user_id, getattr(renderer, 'format', '')
+
+
+def _row_value(row, path):
+    if isinstance(row, dict):
+        return row.get(path)
+    value = row
+    for attribute in path.split('__'):
+        value = getattr(value, attribute, None)
+        if value is None:
+            break
+    return value
+
+
+def get_list_validators(request, rows, fields, count=None):
+    """Compute validators for a list from the rows it is about to return.
+
+    ``rows`` are model instances or ``.values()`` rows. The ETag covers each
+    row's ``id`` and ``fields`` timestamps and the ``count`` sent with them,
+    so it changes whenever the page would, and no query beyond the page
+    fetch is needed. Last-Modified alone cannot reveal a deleted row, so
+    lists only honour ``If-None-Match``.
+    """
+    parts = []
+    present = []
+    for row in rows:
+        timestamps = [_row_value(row, path) for path in fields]
+        parts.append(_row_value(row, 'id'))
+        parts.extend(timestamps)
+        present.extend(timestamp for timestamp in timestamps if isinstance(timestamp, datetime))
+    last_modified = max(present) if present else None
+    etag = _digest(*_representation_key(request), count, *parts)
+    return Validators(etag, last_modified, use_last_modified=False)
+
+
+def get_object_validators(request, instance, fields):
+    """Compute validators for a single object from its (and its relations') timestamps"""
+    timestamps = [_row_value(instance, path) for path in fields]
+
+    present = [timestamp for timestamp in timestamps if isinstance(timestamp, datetime)]
+    last_modified = max(present) if present else None
+    etag = _digest(*_representation_key(request), type(instance).__name__, instance.pk, *timestamps)
+    return Validators(etag, last_modified)
+
+
+class ConditionalGetMixin:
+    """ViewSet mixin computing ETag/Last-Modified validators from ``updated_at`` columns.
+
+    ``validator_fields`` lists the timestamp paths whose changes alter the
+    serialized representation, including those of nested serializers.
+    """
+
+    validator_fields = ['updated_at']
+
+    def get_list_validators(self, rows, count=None):
+        return get_list_validators(self.request, rows, self.validator_fields, count)
+
+    def get_object_validators(self, instance):
+        return get_object_validators(self.request, instance, self.validator_fields)
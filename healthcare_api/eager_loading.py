@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _plan_relations(serializer, model, prefix=''):
+    """Walk a serializer's nested serializers and collect the relations they read.
+
+    Forward foreign keys and one-to-one relations are joined with
+    ``select_related``; to-many relations become ``Prefetch`` objects whose
+    querysets are planned recursively from the child serializer.
+    """
+    select_related = []
+    prefetch_related = []
+
+    for field in serializer.fields.values():
+        if not isinstance(field, serializers.BaseSerializer) or field.source == '*':
+            continue
+        if '.' in field.source:
+            continue
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        related_model = model_field.related_model
+        path = f"{prefix}{field.source}"
+
+        if model_field.many_to_many or model_field.one_to_many:
+            child_select, child_prefetch = _plan_relations(child, related_model)
+            queryset = related_model._default_manager.select_related(*child_select)
+            queryset = queryset.prefetch_related(*child_prefetch)
+            prefetch_related.append(Prefetch(path, queryset=queryset))
+        else:
+            select_related.append(path)
+            child_select, child_prefetch = _plan_relations(child, related_model, prefix=f"{path}__")
+            select_related.extend(child_select)
+            prefetch_related.extend(child_prefetch)
+
+    return select_related, prefetch_related
+
+
+@lru_cache(maxsize=None)
+def get_eager_loading_plan(serializer_class, model):
+    """Return the ``(select_related, prefetch_related)`` lookups for a serializer class."""
+    select_related, prefetch_related = _plan_relations(serializer_class(), model)
+    return tuple(select_related), tuple(prefetch_related)
+
+
+def setup_eager_loading(queryset, serializer_class):
+    """Apply the joins and prefetches needed to serialize ``queryset`` without N+1 queries"""
+    select_related, prefetch_related = get_eager_loading_plan(serializer_class, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """ViewSet mixin that derives eager loading from the active serializer class"""
+
+    def get_queryset(self):
+        """Return the queryset with relations used by the serializer preloaded"""
+        return setup_eager_loading(super().get_queryset(), self.get_serializer_class())
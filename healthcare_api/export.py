@@ -0,0 +1,36 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from healthcare_api.streaming import EXPORT_FORMATS, streaming_content
+
+
+class ExportMixin:
+    """ViewSet mixin adding an ``export`` action that streams the filtered list as CSV or NDJSON.
+    
+    Columns come from the model's ``EXPORT_FIELDS`` and are read with
+    ``values_list()`` from a server-side cursor, bypassing serializers and
+    pagination. The view's queryset, filters and permissions apply unchanged.
+    """
+    
+    export_format_param = 'export_format'
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every row of the filtered list as CSV (default) or NDJSON"""
+        export_format = request.query_params.get(self.export_format_param, 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"{self.export_format_param} must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            streaming_content(request, stream(queryset, queryset.model.EXPORT_FIELDS)),
+            content_type=content_type
+        )
+        filename = f"{queryset.model._meta.model_name}_export.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,294 @@
+import atexit
+import glob
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Timings collected while handling one request.
+
+    ``view`` is the time from URL resolution to the finished response, minus
+    ``render``, the time renderers spend turning response data into bytes;
+    evaluating ``serializer.data`` happens in the view and counts as ``view``.
+    ``db`` is the time spent executing SQL, most of which also falls inside
+    ``view``.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+        self.view = 0.0
+
+    def finish(self):
+        self.view = max(time.perf_counter() - self.started - self.render, 0.0)
+
+    def server_timing(self):
+        """Return the value of a ``Server-Timing`` header, durations in milliseconds"""
+        return (
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries", '
+            f'render;dur={self.render * 1000:.1f}, '
+            f'view;dur={self.view * 1000:.1f}'
+        )
+
+
+@contextmanager
+def collect_metrics():
+    """Collect :class:`RequestMetrics` for the code run inside the block, including worker threads"""
+    metrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+        metrics.finish()
+
+
+@contextmanager
+def timed_rendering():
+    """Add the time spent in the block to the current request's ``render`` timing"""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.render += time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and their time for the current request"""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder, dispatch_uid='healthcare_api.instrumentation')
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed upper bounds"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        """Yield ``(le, cumulative_count)`` pairs, ending with ``+Inf``"""
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            yield bound, cumulative
+
+
+class MetricsRegistry:
+    """Request counters and histograms, labelled by route and method.
+
+    Series are kept per process. When ``REQUEST_METRICS['MULTIPROCESS_DIR']``
+    is set, every process also writes its series to a file of its own there,
+    at most ``flush_interval`` seconds after they change, and ``render()``
+    adds up the files of all processes, so any worker can answer a scrape.
+    """
+
+    metrics = {
+        'http_requests_total': ('counter', 'Requests handled, by route, method and status', None),
+        'http_request_duration_seconds': ('histogram', 'Time to produce the response', DURATION_BUCKETS),
+        'http_request_db_seconds': ('histogram', 'Time spent executing SQL per request', DURATION_BUCKETS),
+        'http_request_render_seconds': ('histogram', 'Time spent rendering the response body', DURATION_BUCKETS),
+        'http_request_queries': ('histogram', 'SQL queries executed per request', QUERY_COUNT_BUCKETS),
+    }
+    flush_interval = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {name: {} for name in self.metrics}
+        self._dirty = False
+        self._flusher_pid = None
+
+    def record(self, route, method, status_code, metrics):
+        labels = (('route', route), ('method', method))
+        observations = {
+            'http_request_duration_seconds': metrics.view + metrics.render,
+            'http_request_db_seconds': metrics.db,
+            'http_request_render_seconds': metrics.render,
+            'http_request_queries': metrics.queries,
+        }
+        with self._lock:
+            counters = self._series['http_requests_total']
+            counter_labels = labels + (('status', str(status_code)),)
+            counters[counter_labels] = counters.get(counter_labels, 0) + 1
+            for name, value in observations.items():
+                series = self._series[name]
+                if labels not in series:
+                    series[labels] = Histogram(self.metrics[name][2])
+                series[labels].observe(value)
+            self._dirty = True
+        if self._flusher_pid != os.getpid() and self._directory():
+            self._start_flusher()
+
+    def reset(self):
+        with self._lock:
+            self._series = {name: {} for name in self.metrics}
+            self._dirty = True
+
+    def flush(self):
+        """Write this process's series to its file in the multiprocess directory, if they changed"""
+        directory = self._directory()
+        if not directory:
+            return
+        if self._flusher_pid != os.getpid():
+            self._start_flusher()
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {
+                name: [
+                    [labels, value if self.metrics[name][0] == 'counter' else [value.counts, value.sum]]
+                    for labels, value in series.items()
+                ]
+                for name, series in self._series.items()
+            }
+            self._dirty = False
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{self._worker_id}.json')
+        # Written aside and renamed, so a scrape never reads half a file
+        with open(f'{path}.tmp', 'w') as file:
+            json.dump(snapshot, file)
+        os.replace(f'{path}.tmp', path)
+
+    def render(self):
+        """Return every series in the Prometheus text exposition format"""
+        if self._directory():
+            self.flush()
+            all_series = self._collect()
+        else:
+            with self._lock:
+                all_series = {name: dict(series) for name, series in self._series.items()}
+
+        lines = []
+        for name, (kind, description, _) in self.metrics.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(all_series[name].items()):
+                if kind == 'counter':
+                    lines.append(f"{name}{{{_format_labels(labels)}}} {value}")
+                    continue
+                for bound, count in value.samples():
+                    bucket_labels = labels + (('le', str(bound)),)
+                    lines.append(f"{name}_bucket{{{_format_labels(bucket_labels)}}} {count}")
+                lines.append(f"{name}_sum{{{_format_labels(labels)}}} {value.sum}")
+                lines.append(f"{name}_count{{{_format_labels(labels)}}} {sum(value.counts)}")
+        return '\n'.join(lines) + '\n'
+
+    def _directory(self):
+        return settings.REQUEST_METRICS.get('MULTIPROCESS_DIR')
+
+    def _start_flusher(self):
+        # Runs once per process; a forked worker inherits the registry but not the thread
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            self._worker_id = f'{os.getpid()}-{uuid4().hex}'
+        threading.Thread(target=self._flush_periodically, name='metrics-flusher', daemon=True).start()
+        atexit.register(self.flush)
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Could not write request metrics to %s", self._directory())
+
+    def _collect(self):
+        """Add up the series written by every process, including those that have exited"""
+        merged = {name: {} for name in self.metrics}
+        for path in glob.glob(os.path.join(self._directory(), '*.json')):
+            with open(path) as file:
+                snapshot = json.load(file)
+            for name, entries in snapshot.items():
+                if name not in merged:
+                    continue
+                series = merged[name]
+                for labels, value in entries:
+                    labels = tuple(tuple(label) for label in labels)
+                    if self.metrics[name][0] == 'counter':
+                        series[labels] = series.get(labels, 0) + value
+                        continue
+                    counts, total = value
+                    if labels not in series:
+                        series[labels] = Histogram(self.metrics[name][2])
+                    histogram = series[labels]
+                    histogram.counts = [sum(pair) for pair in zip(histogram.counts, counts)]
+                    histogram.sum += total
+        return merged
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    return ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels)
+
+
+registry = MetricsRegistry()
+
+
+@require_GET
+def metrics_view(request):
+    """Serve the request metrics in the Prometheus text format.
+
+    They cover every worker when ``METRICS_MULTIPROCESS_DIR`` is set, and
+    only the answering process otherwise.
+
+    With ``METRICS_TOKEN`` set the request must carry it as a bearer token;
+    without one only the addresses in ``METRICS_ALLOWED_ADDRESSES`` are served.
+    """
+    token = settings.REQUEST_METRICS['TOKEN']
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            return HttpResponse(status=401)
+    elif request.META.get('REMOTE_ADDR') not in settings.REQUEST_METRICS['ALLOWED_ADDRESSES']:
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
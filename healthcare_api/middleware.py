@@ -0,0 +1,213 @@
+import zlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from healthcare_api.instrumentation import collect_metrics, logger as metrics_logger, registry
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+class GzipCompressor:
+    def __init__(self, config):
+        self._compressor = zlib.compressobj(config['GZIP_LEVEL'], zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, config):
+        self._compressor = brotli.Compressor(quality=config['BROTLI_QUALITY'])
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+# In order of preference when the client accepts several with the same q-value
+COMPRESSORS = {'br': BrotliCompressor, 'gzip': GzipCompressor} if brotli else {'gzip': GzipCompressor}
+
+
+def negotiate_encoding(accept_encoding, available=tuple(COMPRESSORS)):
+    """Return the content coding to use for an ``Accept-Encoding`` header, or ``None``"""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+
+    candidates = [
+        (accepted.get(coding, accepted.get('*', 0.0)), -index, coding)
+        for index, coding in enumerate(available)
+    ]
+    quality, _, coding = max(candidates, default=(0.0, 0, None))
+    return coding if quality > 0 else None
+
+
+def _compress_stream(chunks, compressor):
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _compress_async_stream(chunks, compressor):
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compression_exempt(view_func):
+    """Mark a view whose responses must never be compressed.
+
+    Use it on views that put a secret in the body, such as issued tokens:
+    compressing a secret next to attacker-influenced input leaks it through
+    the compressed length (BREACH).
+    """
+    def wrapper_view(*args, **kwargs):
+        return view_func(*args, **kwargs)
+
+    wrapper_view.compression_exempt = True
+    return wraps(view_func)(wrapper_view)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress text responses with brotli or gzip, as negotiated by ``Accept-Encoding``.
+
+    Bodies smaller than ``RESPONSE_COMPRESSION['MIN_SIZE']`` bytes are sent
+    as is. Streaming responses are compressed chunk by chunk and flushed so
+    they keep streaming. Strong ETags are weakened because the encoded bytes
+    differ from the representation they were computed for. Views marked
+    with ``compression_exempt`` are never compressed.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, 'compression_exempt', False):
+            request.compression_exempt = True
+
+    def process_response(self, request, response):
+        if getattr(request, 'compression_exempt', False) or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+
+        config = settings.RESPONSE_COMPRESSION
+        if not response.streaming and len(response.content) < config['MIN_SIZE']:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressor = COMPRESSORS[encoding](config)
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(response.streaming_content, compressor)
+            else:
+                response.streaming_content = _compress_stream(response.streaming_content, compressor)
+            del response.headers['Content-Length']
+        else:
+            compressed = compressor.compress(response.content) + compressor.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Record SQL count, DB, render and view time for every request.
+
+    The timings are sent back in a ``Server-Timing`` header and aggregated
+    into per-route histograms in ``instrumentation.registry``, served at
+    ``/metrics``. Requests running more queries than the view's
+    ``query_budget`` (default ``REQUEST_METRICS['QUERY_BUDGET']``) are
+    logged as warnings. Place it last in ``MIDDLEWARE`` so it measures the
+    view rather than the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+        return self.process_metrics(request, response, metrics)
+
+    async def __acall__(self, request):
+        with collect_metrics() as metrics:
+            response = await self.get_response(request)
+        return self.process_metrics(request, response, metrics)
+
+    def process_metrics(self, request, response, metrics):
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unmatched'
+        registry.record(route, request.method, response.status_code, metrics)
+
+        budget = self.get_query_budget(match)
+        if budget and metrics.queries > budget:
+            metrics_logger.warning(
+                "%s %s (%s) ran %d queries, over its budget of %d",
+                request.method, request.path, route, metrics.queries, budget
+            )
+
+        if settings.REQUEST_METRICS['SERVER_TIMING']:
+            response.headers['Server-Timing'] = metrics.server_timing()
+        return response
+
+    def get_query_budget(self, match):
+        view_class = None
+        if match is not None:
+            view_class = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+        return getattr(view_class, 'query_budget', settings.REQUEST_METRICS['QUERY_BUDGET'])
@@ -0,0 +1,244 @@
+import base64
+import json
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def approximate_count(queryset):
+    """Estimate the number of rows in a queryset from PostgreSQL planner statistics.
+
+    Unfiltered querysets read ``pg_class.reltuples``; filtered ones use the row
+    estimate of the top plan node from ``EXPLAIN``. Other database vendors fall
+    back to an exact ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            if row is not None and row[0] >= 0:
+                return int(row[0])
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def keyset_filter(position, ordering):
+    """Build a condition selecting rows strictly after ``position`` in ``ordering``.
+
+    The leading column gets a plain range bound so PostgreSQL can drive the
+    scan from the composite index; the remaining columns break ties.
+    """
+    fields = [field.lstrip('-') for field in ordering]
+    lookups = ['lt' if field.startswith('-') else 'gt' for field in ordering]
+
+    condition = Q()
+    for index in range(len(fields) - 1, -1, -1):
+        strict = Q(**{f"{fields[index]}__{lookups[index]}": position[index]})
+        if index == len(fields) - 1:
+            condition = strict
+        else:
+            condition = strict | (Q(**{fields[index]: position[index]}) & condition)
+
+    leading_bound = Q(**{f"{fields[0]}__{lookups[0]}e": position[0]})
+    return leading_bound & condition
+
+
+def _row_value(row, field_name):
+    if isinstance(row, dict):
+        return row[field_name]
+    return getattr(row, field_name)
+
+
+def _invert_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else f"-{field}" for field in ordering)
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on a composite ``(timestamp, id)`` key.
+
+    Each page is fetched with a range condition on the ordering columns, so the
+    cost of a page does not depend on how deep it is and no ``COUNT(*)`` is run.
+    ``count`` is an estimate taken from the query planner.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of rows positioned after the requested cursor"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.count = approximate_count(queryset)
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+        ordering = _invert_ordering(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, ordering))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if rows:
+            self.next_position = self.get_position(rows[-1])
+            self.previous_position = self.get_position(rows[0])
+        else:
+            self.next_position = self.previous_position = position
+
+        return rows
+
+    def get_position(self, row):
+        """Return the ordering key of a row"""
+        return [_row_value(row, field.lstrip('-')) for field in self.ordering]
+
+    def get_keyset_filter(self, position, ordering):
+        """Build a condition selecting rows strictly after ``position`` in ``ordering``"""
+        return keyset_filter(position, ordering)
+
+    def encode_cursor(self, position, reverse):
+        """Encode a position into an opaque cursor URL"""
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in position]
+        payload = json.dumps({'p': values, 'r': reverse}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """Decode the cursor query parameter into ``(position, reverse)``"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError('Cursor does not match ordering')
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            return position, bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class HealthcarePagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset mode.
+
+    Requests carrying ``?pagination=cursor`` (or a ``cursor`` parameter from a
+    previous page) are paginated with :class:`KeysetPagination` on the view's
+    ``keyset_ordering``. ``count`` is exact in page-number mode and estimated
+    in cursor mode.
+    """
+
+    pagination_query_param = 'pagination'
+    keyset_pagination_class = KeysetPagination
+
+    def use_keyset(self, request):
+        """Return whether the client asked for cursor pagination"""
+        return (
+            request.query_params.get(self.pagination_query_param) == 'cursor'
+            or self.keyset_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.keyset_paginator = self.keyset_pagination_class()
+            rows = self.keyset_paginator.paginate_queryset(queryset, request, view)
+            self.count = self.keyset_paginator.count
+            return rows
+
+        self.keyset_paginator = None
+        page = super().paginate_queryset(queryset, request, view)
+        if page is not None:
+            self.count = self.page.paginator.count
+        return page
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async version of :meth:`paginate_queryset` for async views.
+
+        Page-number mode runs its ``COUNT(*)`` and page query on the async
+        ORM; keyset mode runs in a worker thread.
+        """
+        if self.use_keyset(request):
+            return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+        self.keyset_paginator = None
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        self.count = paginator.count
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
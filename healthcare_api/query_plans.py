@@ -0,0 +1,165 @@
+import inspect
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from sync.mixins import encode_watermark
+
+INDEX_PATTERN = re.compile(r'(?:Index Scan|Index Only Scan) using (\S+)|Bitmap Index Scan on (\S+)')
+
+
+class NoPlanData(Exception):
+    """Raised when the database has no rows to build representative queries from"""
+
+
+def build_view(viewset_class, action, user, params=None, **kwargs):
+    """Return a ``viewset_class`` instance prepared, as ``dispatch()`` would, to handle a GET ``action``.
+
+    The request is authenticated as ``user``, so owner scoping in
+    ``get_queryset()`` applies, and ``params`` become its query string.
+    """
+    # Paginators build absolute links, so the request needs a host the site accepts
+    host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+    request = APIRequestFactory().get('/', params or {}, HTTP_HOST=host)
+    force_authenticate(request, user=user)
+    view = viewset_class()
+    view.action_map = {'get': action}
+    view.args, view.kwargs = (), kwargs
+    view.format_kwarg = None
+    view.headers = {}
+    view.request = view.initialize_request(request)
+    view.initial(view.request)
+    return view
+
+
+def action_queries(view):
+    """Return the SQL run by the view's action handler.
+
+    Everything the action executes is captured: the lookup or page query,
+    prefetches, counts and the rows behind its validators. Response caching
+    decorators are bypassed, so these are the queries of a cache miss.
+    """
+    handler = inspect.unwrap(getattr(type(view), view.action))
+    with CaptureQueriesContext(connection) as captured:
+        handler(view, view.request, **view.kwargs)
+    return _selects(captured)
+
+
+def get_plan_queries():
+    """Yield ``(description, [sql, ...])`` for the reads the API serves most.
+
+    Rows of the current data are picked as parameters: the busiest doctor,
+    since per-doctor queries are worst for it, and a patient with mappings.
+    """
+    from auth_app.models import CustomUser
+    from doctors.models import Doctor
+    from doctors.views import DoctorViewSet
+    from mappings.models import PatientDoctorMapping
+    from mappings.views import PatientDoctorMappingViewSet
+    from patients.models import Patient
+    from patients.views import PatientViewSet
+
+    doctor = Doctor.objects.order_by('-created_at').first()
+    busiest = (
+        PatientDoctorMapping.objects.values('doctor_id').annotate(mappings=Count('id')).order_by('-mappings').first()
+    )
+    patient = Patient.objects.filter(doctor_mappings__isnull=False).select_related('user').first()
+    if doctor is None or busiest is None or patient is None:
+        raise NoPlanData('No data to plan against; run manage.py seed_healthcare first')
+    user = patient.user
+    # A client that synced recently, a few changes behind the head of the feed
+    horizon = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    behind = (
+        Doctor.objects.filter(updated_at__lt=horizon).order_by('-updated_at', '-id')
+        .values_list('updated_at', 'pk')[settings.REST_FRAMEWORK['PAGE_SIZE']:].first()
+    )
+    changes = {'updated_since': encode_watermark(*behind, 0)} if behind else {}
+
+    yield 'login user lookup', _queryset_sql(CustomUser.objects.filter(email=user.email))
+    yield 'doctor list', action_queries(build_view(DoctorViewSet, 'list', user, {'pagination': 'cursor'}))
+    yield 'doctor list ?is_active=true', action_queries(
+        build_view(DoctorViewSet, 'list', user, {'pagination': 'cursor', 'is_active': 'true'})
+    )
+    yield 'doctor list ?specialization', action_queries(
+        build_view(DoctorViewSet, 'list', user, {'specialization': doctor.specialization})
+    )
+    # A full name, as typed into the directory search; one common surname alone can match too many rows
+    yield 'doctor search', action_queries(
+        build_view(DoctorViewSet, 'list', user, {'search': f"{doctor.first_name} {doctor.last_name}"})
+    )
+    yield 'doctor detail', action_queries(build_view(DoctorViewSet, 'retrieve', user, pk=doctor.pk))
+    yield 'doctor changes', action_queries(build_view(DoctorViewSet, 'changes', user, changes))
+    yield "user's patients", action_queries(build_view(PatientViewSet, 'list', user))
+    yield 'mapping list', action_queries(
+        build_view(PatientDoctorMappingViewSet, 'list', user, {'pagination': 'cursor'})
+    )
+    yield 'mappings by_patient', action_queries(
+        build_view(PatientDoctorMappingViewSet, 'by_patient', user, {'patient_id': patient.pk})
+    )
+    yield 'mappings ?patient&status', action_queries(
+        build_view(PatientDoctorMappingViewSet, 'list', user, {'patient': patient.pk, 'status': 'ACTIVE'})
+    )
+    yield 'mappings ?doctor', action_queries(
+        build_view(PatientDoctorMappingViewSet, 'list', user, {'pagination': 'cursor', 'doctor': busiest['doctor_id']})
+    )
+    yield 'mappings ?doctor&status', action_queries(build_view(
+        PatientDoctorMappingViewSet, 'list', user,
+        {'pagination': 'cursor', 'doctor': busiest['doctor_id'], 'status': 'SUSPENDED'}
+    ))
+    yield 'mappings ?status', action_queries(
+        build_view(PatientDoctorMappingViewSet, 'list', user, {'pagination': 'cursor', 'status': 'SUSPENDED'})
+    )
+    yield 'mapping duplicate check', _queryset_sql(
+        PatientDoctorMapping.objects.filter(patient_id=patient.pk, doctor_id=busiest['doctor_id'])
+    )
+
+
+def _queryset_sql(queryset):
+    with CaptureQueriesContext(connection) as captured:
+        list(queryset)
+    return _selects(captured)
+
+
+def _selects(captured):
+    # Skip the paginator's own EXPLAIN for estimated counts
+    return [query['sql'] for query in captured if query['sql'].lstrip().upper().startswith('SELECT')]
+
+
+def refresh_statistics(tables):
+    """ANALYZE ``tables`` and merge the pending lists of their GIN indexes.
+
+    Rows inserted since the last VACUUM wait in a GIN index's pending list,
+    which the planner costs as a sequential read; right after seeding that
+    makes full text search look cheaper as a table scan.
+    """
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f'ANALYZE "{table}"')
+        cursor.execute(
+            "SELECT gin_clean_pending_list(index.indexrelid) FROM pg_index index "
+            "JOIN pg_class class ON class.oid = index.indexrelid JOIN pg_am am ON am.oid = class.relam "
+            "WHERE am.amname = 'gin' AND index.indrelid = ANY(%s::regclass[])",
+            [tables]
+        )
+
+
+def explain(sql):
+    """Return the text of the PostgreSQL plan for ``sql``, a query captured with its parameters inlined"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN {sql}')
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+def sequential_scans(plan, tables):
+    """Return the ``tables`` that ``plan`` reads with a sequential scan"""
+    return [table for table in tables if re.search(rf'Seq Scan on {re.escape(table)}\b', plan)]
+
+
+def plan_indexes(plan):
+    """Return the names of the indexes ``plan`` scans"""
+    return sorted({first or second for first, second in INDEX_PATTERN.findall(plan)})
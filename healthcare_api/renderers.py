@@ -0,0 +1,37 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+from healthcare_api.instrumentation import timed_rendering
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` backed by orjson, producing the same bytes as the stdlib renderer.
+
+    Types orjson does not handle natively (``Decimal``, lazy strings,
+    datetimes) go through DRF's ``JSONEncoder.default`` so their formats are
+    unchanged. Indented output, ASCII-only output and anything orjson
+    rejects (such as integers wider than 64 bits) fall back to the stdlib
+    implementation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_rendering():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_ORJSON_OPTIONS)
+        except (orjson.JSONEncodeError, ValueError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output is safe to embed in <script> tags
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace('\u2028'.encode('utf-8'), b'\\u2028').replace('\u2029'.encode('utf-8'), b'\\u2029')
+        return ret
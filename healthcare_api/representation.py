@@ -0,0 +1,161 @@
+import re
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+_DISPLAY_SOURCE = re.compile(r'^get_(\w+)_display$')
+
+# Fields whose to_representation() returns database values unchanged
+_PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.ChoiceField)
+
+
+def _resolve(instance, column):
+    value = instance
+    for attribute in column.split('__'):
+        value = getattr(value, attribute)
+        if value is None:
+            return None
+    return value
+
+
+class ValuesRepresentation:
+    """Read-only representation of a ``ModelSerializer`` computed from ``.values()`` rows.
+
+    The serializer's fields are compiled once into ``(key, column, convert,
+    nested)`` entries: plain fields copy the column, ``get_<field>_display``
+    sources use a precomputed choice-label dict, and nested serializers on
+    forward relations read prefixed columns of the same row. Keys, order and
+    values match ``serializer.data``. ``fields`` restricts the top-level keys
+    to a subset, which also drops their columns from the query.
+    """
+
+    def __init__(self, serializer, model, prefix='', fields=None):
+        self.entries = []
+        self.columns = []
+        self.field_names = []
+        self.keys = []
+
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.keys.append(key)
+            if fields is not None and key not in fields:
+                continue
+            if field.source == '*' or '.' in field.source:
+                raise ImproperlyConfigured(f"{key}: source {field.source!r} cannot be read from values()")
+
+            if isinstance(field, serializers.BaseSerializer):
+                model_field = model._meta.get_field(field.source)
+                if not model_field.concrete or not (model_field.many_to_one or model_field.one_to_one):
+                    raise ImproperlyConfigured(f"{key}: only forward relations can be read from values()")
+                nested = ValuesRepresentation(field, model_field.related_model, f"{prefix}{field.source}__")
+                self.add(key, f"{prefix}{model_field.attname}", nested=nested)
+                self.columns.extend(nested.columns)
+                self.field_names.append(f"{prefix}{model_field.name}")
+                self.field_names.extend(nested.field_names)
+                continue
+
+            display = _DISPLAY_SOURCE.match(field.source)
+            if display:
+                choices_field = model._meta.get_field(display.group(1))
+                labels = {value: str(label) for value, label in choices_field.flatchoices}
+                self.add(key, f"{prefix}{choices_field.attname}", lambda value, labels=labels: labels.get(value, value))
+                self.field_names.append(f"{prefix}{choices_field.name}")
+                continue
+
+            model_field = model._meta.get_field(field.source)
+            convert = None if isinstance(field, _PASSTHROUGH_FIELDS) else field.to_representation
+            self.add(key, f"{prefix}{model_field.attname}", convert)
+            self.field_names.append(f"{prefix}{model_field.name}")
+
+    def add(self, key, column, convert=None, nested=None):
+        self.entries.append((key, column, convert, nested))
+        self.columns.append(column)
+
+    def values(self, queryset, extra_columns=()):
+        """Return ``queryset`` as ``.values()`` rows carrying every column this representation reads"""
+        columns = list(dict.fromkeys([*self.columns, *extra_columns]))
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def to_representation(self, row):
+        """Return the serialized form of one ``.values()`` row"""
+        data = {}
+        for key, column, convert, nested in self.entries:
+            value = row[column]
+            if value is None:
+                data[key] = None
+            elif nested is not None:
+                data[key] = nested.to_representation(row)
+            elif convert is None:
+                data[key] = value
+            else:
+                data[key] = convert(value)
+        return data
+
+    def represent_rows(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def represent_object(self, instance):
+        """Return the serialized form of a model instance, reading the same columns"""
+        return self.to_representation({column: _resolve(instance, column) for column in self.columns})
+
+
+@lru_cache(maxsize=256)
+def get_values_representation(serializer_class, fields=None):
+    """Return the compiled :class:`ValuesRepresentation` of a ``ModelSerializer`` class"""
+    return ValuesRepresentation(serializer_class(), serializer_class.Meta.model, fields=fields)
+
+
+def _split_param(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else []
+
+
+class ValuesRepresentationMixin:
+    """ViewSet mixin serializing list and retrieve responses without model instances.
+
+    Lists fetch ``.values()`` rows with exactly the columns the read
+    serializer needs; writes keep using the regular serializers. Clients can
+    select top-level keys with ``?fields=a,b`` or drop them with
+    ``?exclude=c``; unselected columns are not fetched (``.values()`` for
+    lists, ``.only()`` for retrieve).
+    """
+
+    sparse_fields_param = 'fields'
+    sparse_exclude_param = 'exclude'
+
+    def get_sparse_fields(self):
+        """Return the requested subset of top-level keys, or ``None`` for all of them"""
+        fields = _split_param(self.request.query_params.get(self.sparse_fields_param))
+        exclude = _split_param(self.request.query_params.get(self.sparse_exclude_param))
+        if not fields and not exclude:
+            return None
+
+        keys = get_values_representation(self.get_serializer_class()).keys
+        unknown = [name for name in fields + exclude if name not in keys]
+        if unknown:
+            raise ValidationError({'fields': [f"Unknown fields: {', '.join(unknown)}"]})
+        return tuple(key for key in keys if (not fields or key in fields) and key not in exclude)
+
+    def get_values_representation(self):
+        return get_values_representation(self.get_serializer_class(), self.get_sparse_fields())
+
+    def get_values_queryset(self, queryset):
+        """Return ``queryset`` as rows for :meth:`represent_rows`, keeping keyset ordering and validator columns"""
+        ordering = [field.lstrip('-') for field in getattr(self, 'keyset_ordering', ())]
+        validators = ['id', *getattr(self, 'validator_fields', ())]
+        return self.get_values_representation().values(queryset, extra_columns=ordering + validators)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'retrieve' and self.get_sparse_fields() is not None:
+            field_names = self.get_values_representation().field_names
+            queryset = queryset.only(*field_names, *getattr(self, 'validator_fields', ()))
+        return queryset
+
+    def represent_rows(self, rows):
+        return self.get_values_representation().represent_rows(rows)
+
+    def represent_object(self, instance):
+        return self.get_values_representation().represent_object(instance)
@@ -0,0 +1,119 @@
+import re
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, F, Q, TextField, Value, When
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+SEARCH_CONFIG = 'simple'
+
+_TSQUERY_UNSAFE = re.compile(r"[^\w@.\-]+")
+
+
+def _weighted_vector(expression, weight):
+    return SearchVector(expression, weight=weight, config=SEARCH_CONFIG)
+
+
+def build_search_document(instance):
+    """Return a search document expression built from an instance's current values.
+
+    The expression has no column references, so it can be written in the same
+    INSERT or UPDATE that saves the instance.
+    """
+    vectors = []
+    for field_name, weight in instance.SEARCH_DOCUMENT_FIELDS:
+        field = instance._meta.get_field(field_name)
+        value = getattr(instance, field.attname)
+        if value is None:
+            continue
+        vectors.append(_weighted_vector(Value(str(value)), weight))
+        if field.choices:
+            label = dict(field.flatchoices).get(value)
+            if label is not None:
+                vectors.append(_weighted_vector(Value(str(label)), weight))
+    if not vectors:
+        return None
+    return reduce(lambda left, right: left + right, vectors)
+
+
+def search_document_expression(model):
+    """Return a column-based search document expression for bulk updates"""
+    vectors = []
+    for field_name, weight in model.SEARCH_DOCUMENT_FIELDS:
+        field = model._meta.get_field(field_name)
+        vectors.append(_weighted_vector(F(field_name), weight))
+        if field.choices:
+            labels = Case(
+                *[When(**{field_name: value}, then=Value(str(label))) for value, label in field.flatchoices],
+                output_field=TextField()
+            )
+            vectors.append(_weighted_vector(labels, weight))
+    return reduce(lambda left, right: left + right, vectors)
+
+
+def refresh_search_documents(queryset):
+    """Recompute the stored search document for every row in ``queryset``"""
+    return queryset.update(search_document=search_document_expression(queryset.model))
+
+
+def build_search_query(terms):
+    """Turn search terms into a prefix-matching ``tsquery`` that ANDs every term"""
+    lexemes = []
+    for term in terms:
+        term = _TSQUERY_UNSAFE.sub('', term).strip('.-')
+        if term:
+            lexemes.append(f"{term}:*")
+    if not lexemes:
+        return None
+    return SearchQuery(' & '.join(lexemes), search_type='raw', config=SEARCH_CONFIG)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Search backend that matches stored ``tsvector`` documents through GIN indexes.
+
+    Views list the document columns to match in ``search_document_fields``;
+    columns on related models (``patient__search_document``) are matched with
+    an ``IN`` subquery against the related table so each lookup stays indexed.
+    Results are ranked by relevance unless the client passes an explicit
+    ``ordering``. Views without document fields, and non-PostgreSQL databases,
+    fall back to the ``icontains`` behaviour of ``SearchFilter``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        document_fields = getattr(view, 'search_document_fields', None)
+        terms = self.get_search_terms(request)
+        if not document_fields or not terms or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = build_search_query(terms)
+        if query is None:
+            return queryset.none()
+
+        condition = Q()
+        ranks = []
+        for path in document_fields:
+            condition |= self.get_document_condition(queryset.model, path, query)
+            ranks.append(SearchRank(F(path), query))
+
+        queryset = queryset.filter(condition).annotate(
+            search_rank=reduce(lambda left, right: left + right, ranks)
+        )
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by('-search_rank', *ordering)
+        return queryset
+
+    def get_document_condition(self, model, path, query):
+        """Return a condition matching ``query`` against the document at ``path``"""
+        if '__' not in path:
+            return Q(**{path: query})
+
+        relation, document_field = path.rsplit('__', 1)
+        related_model = model
+        for part in relation.split('__'):
+            related_model = related_model._meta.get_field(part).related_model
+        matches = related_model._default_manager.filter(**{document_field: query}).values('pk')
+        return Q(**{f"{relation}__in": matches})
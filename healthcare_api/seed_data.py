@@ -0,0 +1,32 @@
+# Synthetic data used by manage.py seed_healthcare and the benchmarks that run against it
+
+SEED_PASSWORD = 'SeedPass-2024!'
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth',
+    'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Carlos', 'Karen',
+    'Wei', 'Priya', 'Ahmed', 'Fatima', 'Hiroshi', 'Yuki', 'Olga', 'Ivan', 'Amara', 'Kwame',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Patel', 'Nguyen', 'Khan', 'Chen', 'Kim', 'Singh', 'Ivanova', 'Okafor', 'Mensah',
+]
+CITIES = [
+    ('New York', 'NY'), ('Los Angeles', 'CA'), ('Chicago', 'IL'), ('Houston', 'TX'), ('Phoenix', 'AZ'),
+    ('Philadelphia', 'PA'), ('San Antonio', 'TX'), ('San Diego', 'CA'), ('Dallas', 'TX'), ('Seattle', 'WA'),
+]
+HOSPITALS = ['General Hospital', 'St. Mary Medical Center', 'University Hospital', 'Mercy Clinic', None]
+
+# Relative frequencies, roughly those of a general outpatient network
+SPECIALIZATION_WEIGHTS = {
+    'GP': 30, 'PEDI': 10, 'OB-GYN': 8, 'CARD': 8, 'ORTHO': 8, 'PSY': 7,
+    'DERM': 6, 'NEURO': 5, 'ENT': 5, 'ONCO': 5, 'OTHER': 8,
+}
+BLOOD_TYPE_WEIGHTS = {
+    'O+': 37.4, 'A+': 35.7, 'B+': 8.5, 'O-': 6.6, 'A-': 6.3, 'AB+': 3.4, 'B-': 1.5, 'AB-': 0.6,
+}
+GENDER_WEIGHTS = {'F': 49, 'M': 49, 'O': 2}
+STATUS_WEIGHTS = {'ACTIVE': 80, 'INACTIVE': 15, 'SUSPENDED': 5}
+# Age bands in years and their share of patients
+AGE_BAND_WEIGHTS = {(0, 18): 20, (18, 35): 22, (35, 50): 20, (50, 65): 20, (65, 95): 18}
@@ -25,21 +25,25 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
+    'django_filters',
     
     # Local apps
     'auth_app',
     'patients',
     'doctors',
     'mappings',
+    'sync',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'healthcare_api.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -47,6 +51,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'healthcare_api.middleware.RequestMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'healthcare_api.urls'
@@ -78,9 +83,37 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'password'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Keep connections open between requests instead of reconnecting every time
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # Required behind PgBouncer in transaction pooling mode, where a
+        # WITH HOLD server-side cursor can outlive the server connection
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_PGBOUNCER_TRANSACTION_MODE', 'False') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+# Cache
+# A shared Redis cache is used when REDIS_URL is set (requires the redis
+# package); otherwise each process gets its own in-memory cache.
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -97,6 +130,38 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. New passwords use PASSWORD_HASHER (argon2, scrypt or
+# pbkdf2); hashes made by the others still verify and are upgraded on login
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2')
+_PASSWORD_HASHERS = {
+    'argon2': 'auth_app.hashers.Argon2PasswordHasher',
+    'scrypt': 'auth_app.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Cost parameters. The argon2id defaults are OWASP's minimum (19 MiB, 2
+# passes, 1 lane); Django's own are about 8x more CPU per login
+PASSWORD_HASHER_PARAMS = {
+    'ARGON2_TIME_COST': int(os.getenv('ARGON2_TIME_COST', '2')),
+    'ARGON2_MEMORY_COST': int(os.getenv('ARGON2_MEMORY_COST', '19456')),
+    'ARGON2_PARALLELISM': int(os.getenv('ARGON2_PARALLELISM', '1')),
+    'SCRYPT_WORK_FACTOR': int(os.getenv('SCRYPT_WORK_FACTOR', str(2 ** 14))),
+    'SCRYPT_BLOCK_SIZE': int(os.getenv('SCRYPT_BLOCK_SIZE', '8')),
+    'SCRYPT_PARALLELISM': int(os.getenv('SCRYPT_PARALLELISM', '1')),
+}
+
+# Threads that verify passwords on login, and how many logins may wait for one
+PASSWORD_HASHING_POOL = {
+    'WORKERS': int(os.getenv('PASSWORD_HASHING_WORKERS', str(os.cpu_count() or 1))),
+    'MAX_PENDING': int(os.getenv('PASSWORD_HASHING_MAX_PENDING', '32')),
+    'WAIT_TIMEOUT': float(os.getenv('PASSWORD_HASHING_WAIT_TIMEOUT', '0.5')),
+}
+
+AUTHENTICATION_BACKENDS = ['auth_app.backends.PooledPasswordBackend']
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -117,19 +182,70 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'auth_app.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'healthcare_api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'healthcare_api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'healthcare_api.pagination.HealthcarePagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
-        'rest_framework.filters.SearchFilter',
+        'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.OrderingFilter',
+        'healthcare_api.search.FullTextSearchFilter',
     ],
 }
 
+# Response compression: brotli when the Brotli package is installed, else gzip
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', '1024')),
+    'GZIP_LEVEL': int(os.getenv('RESPONSE_COMPRESSION_GZIP_LEVEL', '6')),
+    'BROTLI_QUALITY': int(os.getenv('RESPONSE_COMPRESSION_BROTLI_QUALITY', '4')),
+}
+
+# Per-request SQL count and DB/render/view timings, sent as a
+# Server-Timing header and aggregated per route at /metrics
+REQUEST_METRICS = {
+    'ENABLED': os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True',
+    'SERVER_TIMING': os.getenv('REQUEST_METRICS_SERVER_TIMING', 'True') == 'True',
+    # Log a warning when a request runs more queries; 0 disables the check
+    'QUERY_BUDGET': int(os.getenv('REQUEST_QUERY_BUDGET', '20')),
+    # Bearer token required by /metrics; when empty only ALLOWED_ADDRESSES are served
+    'TOKEN': os.getenv('METRICS_TOKEN', ''),
+    'ALLOWED_ADDRESSES': os.getenv('METRICS_ALLOWED_ADDRESSES', '127.0.0.1,::1').split(','),
+    # Directory shared by the workers of one server, so /metrics reports all
+    # of them; empty serves only the answering process's own metrics
+    'MULTIPROCESS_DIR': os.getenv('METRICS_MULTIPROCESS_DIR', ''),
+}
+
+# Rows fetched per round trip when streaming large result sets
+STREAMING_CHUNK_SIZE = int(os.getenv('STREAMING_CHUNK_SIZE', '500'))
+
+# Serve the hot read endpoints (doctor list/detail, mappings by_patient,
+# profile) from async views; only useful when deployed under ASGI
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Bulk create/update endpoints
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '10000'))
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '1000'))
+
+# Delta sync change feed (GET .../changes/?updated_since=<token>)
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+SYNC_MAX_PAGE_SIZE = int(os.getenv('SYNC_MAX_PAGE_SIZE', '5000'))
+SYNC_SETTLE_SECONDS = int(os.getenv('SYNC_SETTLE_SECONDS', '2'))
+# Deletion records older than this are removed by manage.py prune_tombstones;
+# clients holding an older token are sent a full resync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', '60'))),
@@ -138,6 +254,35 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
+    'TOKEN_REFRESH_SERIALIZER': 'auth_app.serializers.RevocableTokenRefreshSerializer',
+}
+
+# Revoked refresh tokens. Each process keeps a Bloom filter and an exact set
+# of the revocations it has seen; SHARED_BACKEND ('database', 'cache' or ''
+# for this process only) makes them visible to every worker
+REVOKED_TOKENS = {
+    'SHARED_BACKEND': os.getenv('REVOKED_TOKENS_BACKEND', 'cache' if REDIS_URL else 'database'),
+    'CACHE_ALIAS': 'default',
+    'BLOOM_CAPACITY': int(os.getenv('REVOKED_TOKENS_BLOOM_CAPACITY', '100000')),
+    'BLOOM_ERROR_RATE': float(os.getenv('REVOKED_TOKENS_BLOOM_ERROR_RATE', '0.001')),
+    'LOCAL_MAXSIZE': int(os.getenv('REVOKED_TOKENS_LOCAL_MAXSIZE', '10000')),
+}
+
+# Cache of authenticated users, so JWT authentication skips the user SELECT
+AUTH_USER_CACHE = {
+    'LOCAL_MAXSIZE': int(os.getenv('AUTH_USER_CACHE_LOCAL_MAXSIZE', '10000')),
+    'LOCAL_TTL': int(os.getenv('AUTH_USER_CACHE_LOCAL_TTL', '30')),
+    'SHARED_CACHE_ALIAS': os.getenv('AUTH_USER_CACHE_ALIAS', 'default' if REDIS_URL else '') or None,
+    'SHARED_TTL': int(os.getenv('AUTH_USER_CACHE_SHARED_TTL', '300')),
+}
+
+# Response cache for the doctor directory (list and retrieve). Writes invalidate
+# it through a generation counter in the cache itself, so it is only enabled by
+# default when that cache is shared by every worker.
+DOCTOR_RESPONSE_CACHE = {
+    'ENABLED': os.getenv('DOCTOR_RESPONSE_CACHE_ENABLED', str(bool(REDIS_URL))) == 'True',
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('DOCTOR_RESPONSE_CACHE_TIMEOUT', '300')),
 }
 
 # CORS Configuration
@@ -150,9 +295,15 @@ AUTH_USER_MODEL = 'auth_app.CustomUser'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'verbose': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
         },
     },
     'root': {
@@ -0,0 +1,113 @@
+import csv
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from healthcare_api.renderers import ORJSONRenderer
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _iterate_in_thread(chunks):
+    """Drive the sync generator ``chunks`` one chunk at a time from the event loop.
+
+    Each step runs in the request's sync thread, where the view ran, so the
+    server-side cursor and lazy relation loads use the same connection.
+    """
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    try:
+        while (chunk := await next_chunk(chunks, done)) is not done:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def streaming_content(request, chunks):
+    """Return the generator ``chunks`` in the form the server can stream without buffering.
+
+    Under ASGI, Django 4.2 consumes a sync iterator with ``sync_to_async(list)``
+    and so holds the whole body in memory before sending it; for ASGI requests
+    the chunks are handed over through an async iterator instead.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return _iterate_in_thread(chunks)
+    return chunks
+
+
+def stream_json_list(key, queryset, serializer_class, context=None, chunk_size=None):
+    """Yield a JSON document ``{"<key>": [...], "count": N}`` row by row.
+
+    Rows are read from a server-side cursor with ``.iterator()`` and serialized
+    one chunk at a time, so memory use is bounded by ``chunk_size`` rather than
+    by the size of the queryset.
+    """
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_SIZE
+    renderer = ORJSONRenderer()
+    count = 0
+
+    yield b'{"' + key.encode('utf-8') + b'":['
+    for chunk in _chunks(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        serializer = serializer_class(chunk, many=True, context=context)
+        body = b','.join(renderer.render(item) for item in serializer.data)
+        yield (b',' + body) if count else body
+        count += len(chunk)
+    yield b'],"count":' + str(count).encode('ascii') + b'}'
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line, so ``csv.writer`` builds strings"""
+
+    def write(self, value):
+        return value
+
+
+def _export_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _export_rows(queryset, fields, chunk_size):
+    # values_list() builds its own joins; drop the eager loading meant for serializers
+    queryset = queryset.select_related(None).prefetch_related(None)
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        yield [[_export_value(value) for value in row] for row in chunk]
+
+
+def stream_csv(queryset, fields, chunk_size=None):
+    """Yield ``fields`` of every row in ``queryset`` as CSV, starting with a header line"""
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_SIZE
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields).encode('utf-8')
+    for chunk in _export_rows(queryset, fields, chunk_size):
+        yield ''.join(writer.writerow(row) for row in chunk).encode('utf-8')
+
+
+def stream_ndjson(queryset, fields, chunk_size=None):
+    """Yield ``fields`` of every row in ``queryset`` as one JSON object per line"""
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_SIZE
+    for chunk in _export_rows(queryset, fields, chunk_size):
+        lines = (json.dumps(dict(zip(fields, row)), separators=(',', ':')) + '\n' for row in chunk)
+        yield ''.join(lines).encode('utf-8')
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
@@ -5,3 +5,6 @@ class MappingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mappings'
     verbose_name = 'Patient-Doctor Mappings'
+    
+    def ready(self):
+        import mappings.signals  # noqa: F401
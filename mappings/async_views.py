@@ -0,0 +1,47 @@
+from rest_framework import status
+from rest_framework.response import Response
+from mappings.views import PatientDoctorMappingViewSet
+from patients.models import Patient
+from healthcare_api.async_views import AsyncReadView
+
+
+class AsyncPatientDoctorsView(AsyncReadView):
+    """Async version of ``PatientDoctorMappingViewSet.by_patient``"""
+    
+    view_class = PatientDoctorMappingViewSet
+    action = 'by_patient'
+    
+    async def read(self, request, *args, **kwargs):
+        view = self.view
+        patient_id = request.query_params.get('patient_id')
+        
+        if not patient_id:
+            return Response(
+                {'error': 'patient_id query parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            patient = await Patient.objects.aget(id=patient_id)
+        except Patient.DoesNotExist:
+            return Response(
+                {'error': 'Patient not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        mappings = [mapping async for mapping in view.get_queryset().filter(patient=patient)]
+        validators = view.get_list_validators(mappings, len(mappings))
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        serializer = view.get_serializer(mappings, many=True)
+        
+        return validators.apply(Response(
+            {
+                'patient_id': patient_id,
+                'doctor_count': len(serializer.data),
+                'doctors': serializer.data
+            },
+            status=status.HTTP_200_OK
+        ))
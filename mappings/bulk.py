@@ -0,0 +1,112 @@
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from mappings.serializers import DUPLICATE_ASSIGNMENT_MESSAGE, PatientDoctorMappingCreateUpdateSerializer
+from patients.models import Patient
+from healthcare_api.bulk import BulkResult, bulk_create_checked, get_bulk_instances, validate_bulk_items
+from healthcare_api.caseload import apply_caseload_changes
+
+BULK_UPDATE_FIELDS = ('status', 'notes')
+
+
+def check_references(valid, result):
+    """Reject items naming a missing patient or doctor, or an existing pair, in three queries"""
+    patient_ids = {data['patient_id'] for _, data in valid}
+    doctor_ids = {data['doctor_id'] for _, data in valid}
+    known_patients = set(Patient.objects.filter(pk__in=patient_ids).order_by().values_list('pk', flat=True))
+    known_doctors = set(Doctor.objects.filter(pk__in=doctor_ids).order_by().values_list('pk', flat=True))
+    taken = set(
+        PatientDoctorMapping.objects.filter(patient_id__in=patient_ids, doctor_id__in=doctor_ids)
+        .order_by().values_list('patient_id', 'doctor_id')
+    )
+    
+    for index, data in valid:
+        pair = (data['patient_id'], data['doctor_id'])
+        if pair[0] not in known_patients:
+            result.error(index, {'non_field_errors': ["Patient not found."]})
+        elif pair[1] not in known_doctors:
+            result.error(index, {'non_field_errors': ["Doctor not found."]})
+        elif pair in taken:
+            result.error(index, {'non_field_errors': [DUPLICATE_ASSIGNMENT_MESSAGE]})
+        else:
+            taken.add(pair)
+    
+    return [(index, data) for index, data in valid if not result.is_error(index)]
+
+
+def count_caseloads(rows):
+    """Add newly inserted ``(index, mapping)`` rows to their doctors' and patients' counters"""
+    apply_caseload_changes(change for _, mapping in rows for change in mapping.caseload_changes())
+
+
+def bulk_create_mappings(items, context):
+    """Validate and insert many patient-doctor assignments in one transaction"""
+    result = BulkResult(len(items))
+    valid = validate_bulk_items(PatientDoctorMappingCreateUpdateSerializer, items, result, context)
+    valid = check_references(valid, result)
+    
+    mappings = bulk_create_checked(
+        PatientDoctorMapping, valid, lambda data: PatientDoctorMapping(**data),
+        partial(check_references, result=result), result,
+        {'non_field_errors': [DUPLICATE_ASSIGNMENT_MESSAGE]},
+        on_created=count_caseloads
+    )
+    
+    for index, mapping in mappings:
+        result.success(index, 'created', mapping.pk)
+    return result
+
+
+def bulk_update_mappings(items, context):
+    """Apply status and notes changes to many mappings in one transaction"""
+    result = BulkResult(len(items))
+    instances = get_bulk_instances(PatientDoctorMapping, items, result)
+    for index in list(instances):
+        changed = {'patient_id', 'doctor_id'} & set(items[index])
+        if changed:
+            result.error(index, {field: ["Cannot be changed in a bulk update."] for field in changed})
+            del instances[index]
+    valid = validate_bulk_items(
+        PatientDoctorMappingCreateUpdateSerializer, items, result, context, instances=instances
+    )
+    
+    now = timezone.now()
+    mappings = []
+    if valid:
+        with transaction.atomic():
+            # Locked in primary key order, so the counters move from the committed status, not the one loaded above
+            stored = {
+                pk: (patient_id, doctor_id, status) for pk, patient_id, doctor_id, status in
+                PatientDoctorMapping.objects.filter(pk__in=[instances[index].pk for index, _ in valid])
+                .order_by('pk').select_for_update().values_list('pk', 'patient_id', 'doctor_id', 'status')
+            }
+            # Each row writes only the fields its own item supplied, so concurrent edits to the others survive
+            groups = defaultdict(list)
+            for index, data in valid:
+                mapping = instances[index]
+                if mapping.pk not in stored:
+                    result.error(index, {'id': [f"Object with id {mapping.pk} does not exist."]})
+                    continue
+                mapping._loaded_caseload = stored[mapping.pk]
+                mapping.status = stored[mapping.pk][2]
+                fields = tuple(field for field in BULK_UPDATE_FIELDS if field in data)
+                for field in fields:
+                    setattr(mapping, field, data[field])
+                mapping.updated_at = now
+                groups[fields].append(mapping)
+                mappings.append((index, mapping))
+            
+            for fields, rows in groups.items():
+                PatientDoctorMapping.objects.bulk_update(
+                    rows, fields=[*fields, 'updated_at'], batch_size=settings.BULK_CHUNK_SIZE
+                )
+            apply_caseload_changes(change for _, mapping in mappings for change in mapping.caseload_changes())
+    
+    for index, mapping in mappings:
+        result.success(index, 'updated', mapping.pk)
+    return result
@@ -0,0 +1,18 @@
+from django_filters import rest_framework as filters
+from mappings.models import PatientDoctorMapping
+
+
+class PatientDoctorMappingFilter(filters.FilterSet):
+    """Filter set for PatientDoctorMapping list queries"""
+    
+    # Filter on the raw foreign key columns so no lookup query is run to
+    # validate that the patient or doctor exists.
+    patient = filters.NumberFilter(field_name='patient_id')
+    doctor = filters.NumberFilter(field_name='doctor_id')
+    
+    class Meta:
+        model = PatientDoctorMapping
+        fields = {
+            'status': ['exact'],
+            'assignment_date': ['gte', 'lte'],
+        }
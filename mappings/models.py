@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from patients.models import Patient
 from doctors.models import Doctor
+from healthcare_api.caseload import apply_caseload_changes
 
 
 class PatientDoctorMapping(models.Model):
@@ -12,22 +13,74 @@ class PatientDoctorMapping(models.Model):
         ('SUSPENDED', 'Suspended'),
     ]
     
-    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='doctor_mappings')
-    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='patient_mappings')
+    # Both keys lead a composite index below, so neither needs its own
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='doctor_mappings', db_index=False)
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='patient_mappings', db_index=False)
     assignment_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
     notes = models.TextField(blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    EXPORT_FIELDS = [
+        'id', 'patient_id', 'patient__first_name', 'patient__last_name',
+        'doctor_id', 'doctor__first_name', 'doctor__last_name', 'doctor__specialization',
+        'assignment_date', 'status', 'notes', 'updated_at',
+    ]
+    
     class Meta:
         unique_together = ('patient', 'doctor')
         ordering = ['-assignment_date']
+        # unique_together indexes (patient, doctor), which serves lookups by patient
         indexes = [
-            models.Index(fields=['patient']),
-            models.Index(fields=['doctor']),
-            models.Index(fields=['status']),
-            models.Index(fields='-assignment_date'),
+            # Lists filtered with ?patient&status, in list order
+            models.Index(fields=['patient', 'status', '-assignment_date']),
+            models.Index(fields=['doctor', '-assignment_date']),
+            models.Index(fields=['doctor', 'status', '-assignment_date']),
+            models.Index(fields=['status', '-assignment_date']),
+            models.Index(fields=['-assignment_date', '-id']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
         return f"{self.patient.first_name} {self.patient.last_name} - Dr. {self.doctor.first_name} {self.doctor.last_name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_caseload = instance.caseload_key()
+        return instance
+    
+    def caseload_key(self):
+        """Return the ``(patient_id, doctor_id, status)`` this mapping counts towards, or ``None`` if deferred"""
+        key = tuple(self.__dict__.get(name) for name in ('patient_id', 'doctor_id', 'status'))
+        return None if None in key else key
+    
+    def caseload_changes(self):
+        """Return the counter changes since the mapping was loaded, as ``apply_caseload_changes`` takes them"""
+        previous = getattr(self, '_loaded_caseload', None)
+        current = self.caseload_key()
+        if previous == current or current is None:
+            return []
+        changes = [(*current, 1)]
+        if previous is not None:
+            changes.append((*previous, -1))
+        return changes
+    
+    def save(self, *args, **kwargs):
+        """Save the mapping and move it between caseload counters in the same transaction"""
+        update_fields = kwargs.get('update_fields')
+        moves = update_fields is None or not {
+            'patient', 'patient_id', 'doctor', 'doctor_id', 'status'
+        }.isdisjoint(update_fields)
+        with transaction.atomic():
+            if moves and not self._state.adding:
+                # Diff against the committed row, locked until the counters move, not the one loaded earlier
+                self._loaded_caseload = (
+                    PatientDoctorMapping.objects.filter(pk=self.pk).order_by().select_for_update()
+                    .values_list('patient_id', 'doctor_id', 'status').first()
+                )
+            super().save(*args, **kwargs)
+            if moves:
+                apply_caseload_changes(self.caseload_changes())
+        if moves:
+            self._loaded_caseload = self.caseload_key()
@@ -1,8 +1,18 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Exists
 from rest_framework import serializers
 from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from doctors.models import Doctor
 from patients.serializers import PatientSerializer
 from doctors.serializers import DoctorSerializer
 
+DUPLICATE_ASSIGNMENT_MESSAGE = "This patient is already assigned to this doctor."
+
+# SQLSTATEs raised by PostgreSQL for a unique_together and a foreign key violation
+UNIQUE_VIOLATION = '23505'
+FOREIGN_KEY_VIOLATION = '23503'
+
 
 class PatientDoctorMappingSerializer(serializers.ModelSerializer):
     """Serializer for PatientDoctorMapping model"""
@@ -11,7 +21,7 @@ class PatientDoctorMappingSerializer(serializers.ModelSerializer):
     doctor = DoctorSerializer(read_only=True)
     patient_id = serializers.IntegerField(write_only=True)
     doctor_id = serializers.IntegerField(write_only=True)
-    get_status_display = serializers.CharField(source='get_status_display', read_only=True)
+    get_status_display = serializers.CharField(read_only=True)
     
     class Meta:
         model = PatientDoctorMapping
@@ -22,44 +32,55 @@ class PatientDoctorMappingSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'assignment_date', 'updated_at', 'patient', 'doctor']
     
     def validate(self, data):
-        """Validate that patient and doctor exist and check for duplicates"""
-        from patients.models import Patient
-        from doctors.models import Doctor
+        """Validate that patient and doctor exist and check for duplicates in one query"""
+        if self.context.get('bulk'):
+            # Existence and duplicates are checked for the whole batch at once
+            return data
         
-        patient_id = data.get('patient_id')
-        doctor_id = data.get('doctor_id')
+        patient_id = data.get('patient_id', getattr(self.instance, 'patient_id', None))
+        doctor_id = data.get('doctor_id', getattr(self.instance, 'doctor_id', None))
         
-        try:
-            patient = Patient.objects.get(id=patient_id)
-        except Patient.DoesNotExist:
-            raise serializers.ValidationError("Patient not found.")
-        
-        try:
-            doctor = Doctor.objects.get(id=doctor_id)
-        except Doctor.DoesNotExist:
-            raise serializers.ValidationError("Doctor not found.")
+        # Nothing to look up when an update leaves both references untouched
+        if self.instance is not None and (patient_id, doctor_id) == (self.instance.patient_id, self.instance.doctor_id):
+            return data
         
-        # Check if mapping already exists
-        if PatientDoctorMapping.objects.filter(patient=patient, doctor=doctor).exists():
-            raise serializers.ValidationError("This patient is already assigned to this doctor.")
+        assignments = PatientDoctorMapping.objects.filter(patient_id=patient_id, doctor_id=doctor_id)
+        if self.instance is not None:
+            assignments = assignments.exclude(pk=self.instance.pk)
+        row = Patient.objects.filter(pk=patient_id).annotate(
+            doctor_found=Exists(Doctor.objects.filter(pk=doctor_id)),
+            already_assigned=Exists(assignments)
+        ).values_list('doctor_found', 'already_assigned')[:1]
+        row = next(iter(row), None)
         
-        data['patient'] = patient
-        data['doctor'] = doctor
+        if row is None:
+            raise serializers.ValidationError("Patient not found.")
+        if not row[0]:
+            raise serializers.ValidationError("Doctor not found.")
+        if row[1]:
+            raise serializers.ValidationError(DUPLICATE_ASSIGNMENT_MESSAGE)
         return data
     
+    def save_guarded(self, write, *args):
+        """Run a write, reporting constraint violations from concurrent requests as validation errors"""
+        try:
+            with transaction.atomic():
+                return write(*args)
+        except IntegrityError as exc:
+            pgcode = getattr(exc.__cause__, 'pgcode', None)
+            if pgcode == UNIQUE_VIOLATION:
+                raise serializers.ValidationError(DUPLICATE_ASSIGNMENT_MESSAGE)
+            if pgcode == FOREIGN_KEY_VIOLATION:
+                raise serializers.ValidationError("Patient or doctor not found.")
+            raise
+    
     def create(self, validated_data):
         """Create mapping with patient and doctor"""
-        patient = validated_data.pop('patient')
-        doctor = validated_data.pop('doctor')
-        validated_data.pop('patient_id', None)
-        validated_data.pop('doctor_id', None)
-        
-        mapping = PatientDoctorMapping.objects.create(
-            patient=patient,
-            doctor=doctor,
-            **validated_data
-        )
-        return mapping
+        return self.save_guarded(super().create, validated_data)
+    
+    def update(self, instance, validated_data):
+        """Update mapping, reassigning patient or doctor if given"""
+        return self.save_guarded(super().update, instance, validated_data)
 
 
 class PatientDoctorMappingCreateUpdateSerializer(PatientDoctorMappingSerializer):
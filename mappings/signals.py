@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from mappings.models import PatientDoctorMapping
+from healthcare_api.caseload import apply_caseload_changes
+
+
+@receiver(post_delete, sender=PatientDoctorMapping)
+def release_caseload(sender, instance, **kwargs):
+    """Take a deleted mapping off its counters, including cascaded deletes"""
+    key = instance.caseload_key()
+    if key is not None:
+        apply_caseload_changes([(*key, -1)])
@@ -0,0 +1,83 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from auth_app.models import CustomUser
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from healthcare_api.query_plans import explain, get_plan_queries, refresh_statistics, sequential_scans
+
+
+class MappingTestCase(TestCase):
+    """Test case with an owner, their patient and helpers to assign doctors to that patient"""
+    
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', password='Passw0rd!x', name='Owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.patient = self.create_patient(self.user)
+        self.created = 0
+    
+    def create_patient(self, user):
+        return Patient.objects.create(
+            user=user, first_name='Jane', last_name='Doe', email=user.email, phone='123',
+            date_of_birth=date(1990, 1, 1), gender='F', address='1 Main St', city='Springfield',
+            state='IL', postal_code='62701'
+        )
+    
+    def add_mappings(self, count):
+        """Assign ``count`` new doctors, each with a user account, to the patient"""
+        for _ in range(count):
+            self.created += 1
+            user = CustomUser.objects.create_user(
+                email=f"doctor{self.created}@example.com", password='Passw0rd!x', name=f"Doctor {self.created}"
+            )
+            doctor = Doctor.objects.create(
+                user=user, first_name='Greg', last_name=f"House{self.created}", email=user.email,
+                phone='123', gender='M', specialization='GP', license_number=f"LIC-{self.created}"
+            )
+            PatientDoctorMapping.objects.create(patient=self.patient, doctor=doctor)
+
+
+class EagerLoadingQueryCountTests(MappingTestCase):
+    """List endpoints must run the same number of queries however many rows they return"""
+    
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+    
+    def test_query_count_is_constant(self):
+        urls = ['/api/mappings/', f"/api/mappings/by_patient/?patient_id={self.patient.pk}", '/api/doctors/']
+        self.add_mappings(1)
+        baseline = {url: self.count_queries(url) for url in urls}
+        
+        self.add_mappings(9)
+        for url in urls:
+            with self.subTest(url=url), self.assertNumQueries(baseline[url]):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+
+class QueryPlanTests(TestCase):
+    """The queries the viewsets build for their main reads must be served by indexes on realistic data"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_healthcare', doctors=1200, patients=1200, stdout=StringIO())
+        cls.tables = [model._meta.db_table for model in (CustomUser, Doctor, Patient, PatientDoctorMapping)]
+        refresh_statistics(cls.tables)
+    
+    def test_queries_use_indexes(self):
+        for name, statements in get_plan_queries():
+            with self.subTest(query=name):
+                self.assertTrue(statements)
+                for sql in statements:
+                    plan = explain(sql)
+                    self.assertEqual(sequential_scans(plan, self.tables), [], f"{sql}\n{plan}")
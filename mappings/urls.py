@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from mappings.views import PatientDoctorMappingViewSet
@@ -10,3 +11,12 @@ router.register(r'', PatientDoctorMappingViewSet, basename='mapping')
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    from mappings.async_views import AsyncPatientDoctorsView
+    
+    urlpatterns = [
+        path('by_patient/', AsyncPatientDoctorsView.as_view(
+            fallback=PatientDoctorMappingViewSet.as_view({'get': 'by_patient'})
+        ), name='mapping-by-patient'),
+    ] + urlpatterns
@@ -4,18 +4,32 @@ from rest_framework.response import Response
 from mappings.models import PatientDoctorMapping
 from patients.models import Patient
 from mappings.serializers import PatientDoctorMappingSerializer, PatientDoctorMappingCreateUpdateSerializer
+from mappings.filters import PatientDoctorMappingFilter
+from mappings.bulk import bulk_create_mappings, bulk_update_mappings
+from healthcare_api.bulk import get_bulk_items
+from healthcare_api.conditional import ConditionalGetMixin
+from healthcare_api.export import ExportMixin
+from healthcare_api.eager_loading import EagerLoadingMixin
+from sync.mixins import ChangeFeedMixin
 
 
-class PatientDoctorMappingViewSet(viewsets.ModelViewSet):
+class PatientDoctorMappingViewSet(EagerLoadingMixin, ConditionalGetMixin, ChangeFeedMixin, ExportMixin, viewsets.ModelViewSet):
     """ViewSet for PatientDoctorMapping CRUD operations"""
     
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = [
+        'updated_at', 'patient__updated_at', 'patient__user__updated_at',
+        'doctor__updated_at', 'doctor__user__updated_at',
+    ]
+    change_feed_key = 'mappings'
     serializer_class = PatientDoctorMappingSerializer
     queryset = PatientDoctorMapping.objects.all()
-    filterset_fields = ['status', 'patient', 'doctor']
+    filterset_class = PatientDoctorMappingFilter
     search_fields = ['patient__first_name', 'patient__last_name', 'doctor__first_name', 'doctor__last_name']
+    search_document_fields = ['patient__search_document', 'doctor__search_document']
     ordering_fields = ['assignment_date', 'status']
     ordering = ['-assignment_date']
+    keyset_ordering = ['-assignment_date', '-id']
     
     def get_serializer_class(self):
         """Use different serializer for different actions"""
@@ -40,27 +54,38 @@ class PatientDoctorMappingViewSet(viewsets.ModelViewSet):
         """List all mappings"""
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        count = self.paginator.count if page is not None else len(rows)
+        validators = self.get_list_validators(rows, count)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        serializer = self.get_serializer(rows, many=True)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response({
-                'count': self.paginator.count,
+            return validators.apply(self.get_paginated_response({
+                'count': count,
                 'mappings': serializer.data
-            })
+            }))
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
+        return validators.apply(Response(
             {
-                'count': len(serializer.data),
+                'count': count,
                 'mappings': serializer.data
             },
             status=status.HTTP_200_OK
-        )
+        ))
     
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a specific mapping"""
         instance = self.get_object()
+        validators = self.get_object_validators(instance)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
         serializer = self.get_serializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return validators.apply(Response(serializer.data, status=status.HTTP_200_OK))
     
     def update(self, request, *args, **kwargs):
         """Update a mapping (full update)"""
@@ -118,17 +143,22 @@ class PatientDoctorMappingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        mappings = PatientDoctorMapping.objects.filter(patient=patient)
+        mappings = list(self.get_queryset().filter(patient=patient))
+        validators = self.get_list_validators(mappings, len(mappings))
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
         serializer = self.get_serializer(mappings, many=True)
         
-        return Response(
+        return validators.apply(Response(
             {
                 'patient_id': patient_id,
                 'doctor_count': len(serializer.data),
                 'doctors': serializer.data
             },
             status=status.HTTP_200_OK
-        )
+        ))
     
     @action(detail=False, methods=['get'])
     def statuses(self, request):
@@ -138,3 +168,12 @@ class PatientDoctorMappingViewSet(viewsets.ModelViewSet):
             for choice in PatientDoctorMapping.STATUS_CHOICES
         ]
         return Response(statuses, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """Create (POST) or update the status/notes (PATCH) of many mappings in one transaction"""
+        items = get_bulk_items(request)
+        context = self.get_serializer_context()
+        if request.method == 'POST':
+            return bulk_create_mappings(items, context).to_response(status.HTTP_201_CREATED)
+        return bulk_update_mappings(items, context).to_response()
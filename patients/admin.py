@@ -8,7 +8,9 @@ class PatientAdmin(admin.ModelAdmin):
     list_filter = ('gender', 'blood_type', 'is_active', 'created_at')
     search_fields = ('first_name', 'last_name', 'email', 'phone')
     ordering = ('-created_at',)
-    readonly_fields = ('user', 'created_at', 'updated_at')
+    readonly_fields = (
+        'user', 'active_mapping_count', 'inactive_mapping_count', 'suspended_mapping_count', 'created_at', 'updated_at'
+    )
     
     fieldsets = (
         ('User', {'fields': ('user',)}),
@@ -24,6 +26,9 @@ class PatientAdmin(admin.ModelAdmin):
         ('Emergency Contact', {
             'fields': ('emergency_contact', 'emergency_phone')
         }),
+        ('Caseload', {
+            'fields': ('active_mapping_count', 'inactive_mapping_count', 'suspended_mapping_count')
+        }),
         ('Status', {
             'fields': ('is_active', 'created_at', 'updated_at')
         }),
@@ -0,0 +1,63 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from doctors.filters import DoctorFilter
+from doctors.models import Doctor
+from mappings.filters import PatientDoctorMappingFilter
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from healthcare_api.streaming import EXPORT_FORMATS
+
+EXPORTS = {
+    'doctors': (Doctor, DoctorFilter),
+    'patients': (Patient, None),
+    'mappings': (PatientDoctorMapping, PatientDoctorMappingFilter),
+}
+
+
+class Command(BaseCommand):
+    """Stream a full table extract as CSV or NDJSON"""
+    
+    help = 'Export doctors, patients or mappings as CSV or NDJSON, reading from a server-side cursor.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--output', help='File to write to (default: stdout)')
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='NAME=VALUE',
+            help='Filter with the same parameters as the list endpoint, e.g. --filter status=ACTIVE'
+        )
+        parser.add_argument('--chunk-size', type=int, default=None)
+    
+    def handle(self, *args, **options):
+        model, filterset_class = EXPORTS[options['resource']]
+        queryset = model.objects.all()
+        
+        params = {}
+        for item in options['filter']:
+            name, separator, value = item.partition('=')
+            if not separator:
+                raise CommandError(f"Invalid filter {item!r}, expected NAME=VALUE")
+            params[name] = value
+        if params:
+            if filterset_class is None:
+                raise CommandError(f"{options['resource']} cannot be filtered")
+            unknown = set(params) - set(filterset_class.base_filters)
+            if unknown:
+                raise CommandError(f"Unknown filters: {', '.join(sorted(unknown))}")
+            filterset = filterset_class(params, queryset=queryset)
+            if not filterset.is_valid():
+                raise CommandError(filterset.errors.as_text())
+            queryset = filterset.qs
+        
+        stream, _ = EXPORT_FORMATS[options['format']]
+        chunks = stream(queryset, model.EXPORT_FIELDS, chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,372 @@
+import csv
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework import serializers
+from auth_app.models import CustomUser
+from doctors.cache import doctor_cache
+from doctors.models import Doctor
+from doctors.serializers import DoctorCreateUpdateSerializer
+from mappings.models import PatientDoctorMapping
+from mappings.serializers import PatientDoctorMappingCreateUpdateSerializer
+from patients.models import Patient
+from patients.serializers import PatientCreateUpdateSerializer
+from healthcare_api.caseload import recompute_caseloads
+from healthcare_api.search import refresh_search_documents
+
+STAGING_TABLE = 'healthcare_import_staging'
+# Staging column listing, comma-separated, the columns an input row supplied
+SUPPLIED_COLUMN = 'supplied_columns'
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+class ImportResource:
+    """How rows of one resource are validated, staged, checked and upserted.
+    
+    ``references`` maps natural-key columns read from the file to SQL that
+    resolves them into foreign key columns of the staging table;
+    ``checks`` are ``(condition, field, message)`` rejections evaluated on
+    the staging table; ``unique`` lists column groups that must not repeat
+    within the file. ``conflict`` is the unique key the upsert targets.
+    With ``partial``, an existing row is only updated in the columns its
+    input row supplied.
+    """
+    
+    def __init__(self, model, serializer_class, conflict, partial=False,
+                 excluded=(), resolved=(), references=None, checks=(), unique=()):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.conflict = list(conflict)
+        self.partial = partial
+        self.resolved = list(resolved)
+        self.references = references or {}
+        self.checks = list(checks)
+        self.unique = [list(columns) for columns in unique]
+        
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        self.insert_timestamps = [
+            field.column for field in fields if getattr(field, 'auto_now_add', False) or getattr(field, 'auto_now', False)
+        ]
+        self.update_timestamps = [field.column for field in fields if getattr(field, 'auto_now', False)]
+        # Columns no serializer writes, like the caseload counters, start at their model default
+        self.insert_defaults = {
+            field.column: field.get_default() for field in fields if not field.editable and field.has_default()
+        }
+        self.row_fields = [
+            field for field in fields
+            if field.editable and field.attname not in excluded and field.attname not in self.resolved
+        ]
+    
+    @property
+    def staged_columns(self):
+        return [field.column for field in self.row_fields] + self.resolved
+    
+    def prepare(self, serializer, row):
+        """Validate one input row and return its staging values in ``copy_columns`` order"""
+        missing = {name: ["This field is required."] for name in self.references if not row.get(name)}
+        try:
+            data = serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({**missing, **exc.detail})
+        if missing:
+            raise serializers.ValidationError(missing)
+        
+        instance = self.model(**data)
+        values = [getattr(instance, field.attname) for field in self.row_fields]
+        supplied = [
+            field.column for field in self.row_fields
+            if not self.partial or field.name in data or field.attname in data
+        ]
+        return (
+            values + [None] * len(self.resolved) + [str(row[name]) for name in self.references]
+            + [','.join(supplied)]
+        )
+    
+    @property
+    def copy_columns(self):
+        return self.staged_columns + list(self.references) + [SUPPLIED_COLUMN]
+
+
+RESOURCES = {
+    'doctors': ImportResource(
+        Doctor, DoctorCreateUpdateSerializer,
+        conflict=['license_number'],
+        excluded=['user_id'],
+        checks=[(
+            f"EXISTS (SELECT 1 FROM {_table(Doctor)} d WHERE d.email = s.email AND d.license_number <> s.license_number)",
+            'email', "A doctor with this email already exists."
+        )],
+        unique=[['license_number'], ['email']],
+    ),
+    'patients': ImportResource(
+        Patient, PatientCreateUpdateSerializer,
+        conflict=['user_id'],
+        resolved=['user_id'],
+        references={
+            'user_email': f"UPDATE {STAGING_TABLE} s SET user_id = u.id FROM {_table(CustomUser)} u WHERE u.email = s.user_email",
+        },
+        checks=[("s.user_id IS NULL", 'user_email', "No user with this email.")],
+        unique=[['user_id']],
+    ),
+    'mappings': ImportResource(
+        PatientDoctorMapping, PatientDoctorMappingCreateUpdateSerializer,
+        conflict=['patient_id', 'doctor_id'],
+        partial=True,
+        resolved=['patient_id', 'doctor_id'],
+        references={
+            'patient_user_email': (
+                f"UPDATE {STAGING_TABLE} s SET patient_id = p.id FROM {_table(Patient)} p "
+                f"JOIN {_table(CustomUser)} u ON u.id = p.user_id WHERE u.email = s.patient_user_email"
+            ),
+            'doctor_license_number': (
+                f"UPDATE {STAGING_TABLE} s SET doctor_id = d.id FROM {_table(Doctor)} d "
+                f"WHERE d.license_number = s.doctor_license_number"
+            ),
+        },
+        checks=[
+            ("s.patient_id IS NULL", 'patient_user_email', "Patient not found."),
+            ("s.doctor_id IS NULL", 'doctor_license_number', "Doctor not found."),
+        ],
+        unique=[['patient_id', 'doctor_id']],
+    ),
+}
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def read_rows(path, input_format):
+    """Yield ``(line_number, row)`` pairs from a CSV or NDJSON file.
+    
+    Empty CSV cells are treated as absent so model defaults apply.
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if input_format == 'csv':
+            reader = csv.DictReader(source)
+            for row in reader:
+                yield reader.line_num, {name: value for name, value in row.items() if name and value != ''}
+        else:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield line_number, row if isinstance(row, dict) else None
+
+
+class RejectLog:
+    """Collects rejected rows, keeping a few samples and optionally writing all of them as NDJSON"""
+    
+    def __init__(self, path=None, sample_size=10):
+        self.count = 0
+        self.samples = []
+        self.sample_size = sample_size
+        self.output = open(path, 'w', encoding='utf-8') if path else None
+    
+    def add(self, line, errors):
+        self.count += 1
+        entry = {'line': line, 'errors': errors}
+        if len(self.samples) < self.sample_size:
+            self.samples.append(entry)
+        if self.output:
+            self.output.write(json.dumps(entry) + '\n')
+    
+    def close(self):
+        if self.output:
+            self.output.close()
+
+
+class Command(BaseCommand):
+    """Bulk import legacy data through PostgreSQL COPY and a staging table"""
+    
+    help = (
+        'Import doctors, patients or mappings from CSV/NDJSON: rows are validated with the API '
+        'serializer rules, loaded into a staging table with COPY FROM STDIN and upserted.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(RESOURCES))
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], default=None,
+                            help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per COPY batch')
+        parser.add_argument('--rejects', help='Write every rejected row to this NDJSON file')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and stage, then roll back')
+    
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('import_healthcare_data requires PostgreSQL')
+        
+        resource = RESOURCES[options['resource']]
+        input_format = options['format'] or ('ndjson' if options['path'].endswith(('.ndjson', '.jsonl')) else 'csv')
+        rejects = RejectLog(options['rejects'])
+        timings = {}
+        started = time.monotonic()
+        
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    self.create_staging_table(cursor, resource)
+                    
+                    stage_started = time.monotonic()
+                    read = self.load_staging_table(cursor, resource, options, input_format, rejects)
+                    timings['validate_and_copy'] = time.monotonic() - stage_started
+                    
+                    stage_started = time.monotonic()
+                    self.reject_conflicts(cursor, resource, rejects)
+                    timings['checks'] = time.monotonic() - stage_started
+                    
+                    stage_started = time.monotonic()
+                    rows = self.upsert(cursor, resource)
+                    timings['upsert'] = time.monotonic() - stage_started
+                
+                stage_started = time.monotonic()
+                self.refresh_derived_data(resource, [pk for pk, _ in rows], options['batch_size'])
+                timings['derived_data'] = time.monotonic() - stage_started
+                
+                if options['dry_run']:
+                    transaction.set_rollback(True)
+        finally:
+            rejects.close()
+        
+        elapsed = time.monotonic() - started
+        inserted = sum(1 for _, created in rows if created)
+        self.report(read, inserted, len(rows) - inserted, rejects, timings, elapsed, options['dry_run'])
+    
+    def create_staging_table(self, cursor, resource):
+        """Create a temporary table with the real column types and no constraints"""
+        columns = ', '.join(_quote(column) for column in resource.staged_columns)
+        cursor.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {_table(resource.model)} WITH NO DATA"
+        )
+        extra = ''.join(f", ADD COLUMN {_quote(name)} text" for name in [*resource.references, SUPPLIED_COLUMN])
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE} ADD COLUMN line integer{extra}")
+    
+    def load_staging_table(self, cursor, resource, options, input_format, rejects):
+        """Validate rows and stream the valid ones into the staging table in COPY batches"""
+        serializer = resource.serializer_class(data={}, partial=resource.partial, context={'bulk': True})
+        columns = ', '.join(_quote(column) for column in resource.copy_columns + ['line'])
+        copy_sql = f"COPY {STAGING_TABLE} ({columns}) FROM STDIN"
+        
+        read = 0
+        buffer = io.StringIO()
+        buffered = 0
+        for line, row in read_rows(options['path'], input_format):
+            read += 1
+            if row is None:
+                rejects.add(line, {'non_field_errors': ["Expected a JSON object."]})
+                continue
+            try:
+                values = resource.prepare(serializer, row)
+            except serializers.ValidationError as exc:
+                rejects.add(line, exc.detail)
+                continue
+            buffer.write('\t'.join(_copy_value(value) for value in values + [line]) + '\n')
+            buffered += 1
+            if buffered >= options['batch_size']:
+                self.copy(cursor, copy_sql, buffer)
+                buffer, buffered = io.StringIO(), 0
+        if buffered:
+            self.copy(cursor, copy_sql, buffer)
+        
+        for sql in resource.references.values():
+            cursor.execute(sql)
+        cursor.execute(f"ANALYZE {STAGING_TABLE}")
+        return read
+    
+    def copy(self, cursor, sql, buffer):
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+    
+    def reject_conflicts(self, cursor, resource, rejects):
+        """Delete staged rows that fail a set-based check, recording why"""
+        for condition, field, message in resource.checks:
+            cursor.execute(f"DELETE FROM {STAGING_TABLE} s WHERE {condition} RETURNING s.line")
+            for (line,) in cursor.fetchall():
+                rejects.add(line, {field: [message]})
+        
+        for columns in resource.unique:
+            matches = ' AND '.join(f"s.{_quote(column)} = t.{_quote(column)}" for column in columns)
+            cursor.execute(
+                f"DELETE FROM {STAGING_TABLE} s USING {STAGING_TABLE} t "
+                f"WHERE s.line > t.line AND {matches} RETURNING s.line"
+            )
+            for (line,) in cursor.fetchall():
+                rejects.add(line, {columns[-1]: [f"Duplicate {', '.join(columns)} in the import file."]})
+    
+    def upsert(self, cursor, resource):
+        """Insert new rows and update existing ones; return ``(id, inserted)`` pairs.
+        
+        Rows are upserted in groups that supplied the same columns, so an
+        update leaves the columns its input row omitted unchanged.
+        """
+        columns = resource.staged_columns
+        defaults = resource.insert_defaults
+        insert_columns = ', '.join(_quote(column) for column in columns + resource.insert_timestamps + list(defaults))
+        select_columns = ', '.join(
+            [_quote(column) for column in columns] + ['now()'] * len(resource.insert_timestamps) + ['%s'] * len(defaults)
+        )
+        conflict = ', '.join(_quote(column) for column in resource.conflict)
+        
+        cursor.execute(f"SELECT DISTINCT {SUPPLIED_COLUMN} FROM {STAGING_TABLE}")
+        rows = []
+        for (supplied,) in cursor.fetchall():
+            updated = [
+                column for column in columns if column in supplied.split(',') and column not in resource.conflict
+            ] + resource.update_timestamps
+            # A conflicting row is only returned if it is updated, so fall back to a no-op assignment
+            updates = ', '.join(
+                f"{_quote(column)} = EXCLUDED.{_quote(column)}" for column in updated or resource.conflict[:1]
+            )
+            cursor.execute(
+                f"INSERT INTO {_table(resource.model)} ({insert_columns}) "
+                f"SELECT {select_columns} FROM {STAGING_TABLE} WHERE {SUPPLIED_COLUMN} = %s ORDER BY line "
+                f"ON CONFLICT ({conflict}) DO UPDATE SET {updates} "
+                f"RETURNING id, (xmax = 0)",
+                [*defaults.values(), supplied]
+            )
+            rows.extend(cursor.fetchall())
+        return rows
+    
+    def refresh_derived_data(self, resource, pks, batch_size):
+        """Recompute search documents or caseload counters and drop cached responses for the written rows"""
+        if resource.model is PatientDoctorMapping:
+            # The upsert may have inserted mappings or changed their status
+            for start in range(0, len(pks), batch_size):
+                written = PatientDoctorMapping.objects.filter(pk__in=pks[start:start + batch_size])
+                recompute_caseloads(Patient.objects.filter(pk__in=written.values('patient_id')))
+                recompute_caseloads(Doctor.objects.filter(pk__in=written.values('doctor_id')))
+            return
+        for start in range(0, len(pks), batch_size):
+            refresh_search_documents(resource.model.objects.filter(pk__in=pks[start:start + batch_size]))
+        if resource.model is Doctor and pks:
+            transaction.on_commit(doctor_cache.invalidate)
+    
+    def report(self, read, inserted, updated, rejects, timings, elapsed, dry_run):
+        rate = read / elapsed if elapsed else 0
+        prefix = '[dry run] ' if dry_run else ''
+        self.stdout.write(
+            f"{prefix}Read {read} rows in {elapsed:.2f}s ({rate:.0f} rows/s): "
+            f"{inserted} inserted, {updated} updated, {rejects.count} rejected"
+        )
+        self.stdout.write('  ' + ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()))
+        for sample in rejects.samples:
+            self.stderr.write(f"  line {sample['line']}: {json.dumps(sample['errors'])}")
+        if rejects.count > len(rejects.samples):
+            self.stderr.write(f"  ... {rejects.count - len(rejects.samples)} more rejected rows")
@@ -0,0 +1,168 @@
+import math
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from auth_app.models import CustomUser
+from doctors.cache import doctor_cache
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from healthcare_api.caseload import caseload_expressions, recompute_caseloads
+from healthcare_api.search import search_document_expression
+from healthcare_api.seed_data import (
+    AGE_BAND_WEIGHTS, BLOOD_TYPE_WEIGHTS, CITIES, FIRST_NAMES, GENDER_WEIGHTS, HOSPITALS, LAST_NAMES, SEED_PASSWORD,
+    SPECIALIZATION_WEIGHTS, STATUS_WEIGHTS
+)
+
+
+def _pick(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, doctors, patients and mappings for development and benchmarks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--doctors', type=int, default=200)
+        parser.add_argument('--patients', type=int, default=5000)
+        parser.add_argument(
+            '--mappings-per-patient', type=float, default=2.0,
+            help='mean number of doctors per patient; doctor popularity follows a Zipf-like curve'
+        )
+        parser.add_argument('--seed', type=int, default=1, help='random seed, for reproducible data')
+        parser.add_argument('--domain', default='seed.example.com', help='email domain of generated users')
+        parser.add_argument('--password', default=SEED_PASSWORD, help='password of every generated user')
+        parser.add_argument('--batch-size', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        if options['mappings_per_patient'] < 0:
+            raise CommandError('--mappings-per-patient must not be negative')
+        
+        domain = options['domain']
+        doctor_offset = Doctor.objects.filter(email__endswith=f"@{domain}").count()
+        patient_offset = Patient.objects.filter(email__endswith=f"@{domain}").count()
+        # Appending to an earlier run continues its sequence instead of repeating it
+        rng = random.Random(f"{options['seed']}:{doctor_offset}:{patient_offset}")
+        password = make_password(options['password'])
+        batch_size = options['batch_size']
+        
+        started = time.perf_counter()
+        with transaction.atomic():
+            doctors = self.create_doctors(rng, options['doctors'], doctor_offset, domain, password, batch_size)
+            patients = self.create_patients(rng, options['patients'], patient_offset, domain, password, batch_size)
+            doctor_ids = [doctor.pk for doctor in doctors] or list(
+                Doctor.objects.filter(is_active=True).values_list('pk', flat=True)
+            )
+            mappings = self.create_mappings(
+                rng, [patient.pk for patient in patients], doctor_ids, options['mappings_per_patient'], batch_size
+            )
+            # New rows get their search document and caseload counters in one rewrite
+            for model, rows in ((Doctor, doctors), (Patient, patients)):
+                model.objects.filter(pk__in=[row.pk for row in rows]).update(
+                    search_document=search_document_expression(model), **caseload_expressions(model)
+                )
+            if not doctors:
+                recompute_caseloads(Doctor.objects.filter(pk__in=doctor_ids))
+        doctor_cache.invalidate()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(doctors)} doctors, {len(patients)} patients and {mappings} mappings "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
+        if patients:
+            self.stdout.write(f"Log in as {patients[0].email} with password {options['password']!r}")
+    
+    def create_users(self, emails, names, password, batch_size):
+        return CustomUser.objects.bulk_create(
+            [CustomUser(email=email, name=name, password=password) for email, name in zip(emails, names)],
+            batch_size=batch_size
+        )
+    
+    def create_doctors(self, rng, count, offset, domain, password, batch_size):
+        rows = []
+        for index in range(offset, offset + count):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            city, state = rng.choice(CITIES)
+            rows.append(dict(
+                first_name=first_name, last_name=last_name, email=f"doctor{index}@{domain}",
+                phone=f"555-{rng.randrange(10000):04d}", gender=_pick(rng, GENDER_WEIGHTS),
+                specialization=_pick(rng, SPECIALIZATION_WEIGHTS),
+                license_number=f"SEED-{domain}-{index:07d}", hospital_affiliation=rng.choice(HOSPITALS),
+                experience_years=int(rng.triangular(0, 40, 8)),
+                consultation_fee=Decimal(f"{rng.lognormvariate(math.log(150), 0.35):.2f}"),
+                bio=f"Dr. {last_name} has practised in {city} for many years.",
+                office_address=f"{rng.randrange(1, 999)} Main Street, {city}, {state}",
+                available_days='Mon, Tue, Wed, Thu, Fri', available_hours='9AM-5PM',
+                is_active=rng.random() < 0.95,
+            ))
+        
+        users = self.create_users(
+            [row['email'] for row in rows], [f"{row['first_name']} {row['last_name']}" for row in rows],
+            password, batch_size
+        )
+        return Doctor.objects.bulk_create(
+            [Doctor(user=user, **row) for user, row in zip(users, rows)], batch_size=batch_size
+        )
+    
+    def create_patients(self, rng, count, offset, domain, password, batch_size):
+        today = date.today()
+        rows = []
+        for index in range(offset, offset + count):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            city, state = rng.choice(CITIES)
+            low, high = _pick(rng, AGE_BAND_WEIGHTS)
+            rows.append(dict(
+                first_name=first_name, last_name=last_name, email=f"patient{index}@{domain}",
+                phone=f"555-{rng.randrange(10000):04d}",
+                date_of_birth=today - timedelta(days=int(rng.uniform(low, high) * 365.25)),
+                gender=_pick(rng, GENDER_WEIGHTS), blood_type=_pick(rng, BLOOD_TYPE_WEIGHTS),
+                address=f"{rng.randrange(1, 9999)} Oak Avenue", city=city, state=state,
+                postal_code=f"{rng.randrange(10000, 99999)}",
+                medical_history=rng.choice(['', 'Hypertension', 'Type 2 diabetes', 'Asthma', 'None reported']),
+                allergies=rng.choice(['', 'Penicillin', 'Peanuts', 'None']),
+                emergency_contact=f"{rng.choice(FIRST_NAMES)} {last_name}",
+                emergency_phone=f"555-{rng.randrange(10000):04d}",
+                is_active=rng.random() < 0.97,
+            ))
+        
+        users = self.create_users(
+            [row['email'] for row in rows], [f"{row['first_name']} {row['last_name']}" for row in rows],
+            password, batch_size
+        )
+        return Patient.objects.bulk_create(
+            [Patient(user=user, **row) for user, row in zip(users, rows)], batch_size=batch_size
+        )
+    
+    def create_mappings(self, rng, patient_ids, doctor_ids, mean, batch_size):
+        """Assign each patient a geometric number of doctors, favouring popular ones"""
+        if not doctor_ids or not mean:
+            return 0
+        
+        popularity = [1 / (rank + 1) ** 0.8 for rank in range(len(doctor_ids))]
+        ranked = rng.sample(doctor_ids, len(doctor_ids))
+        # Geometric count starting at 1, so its mean is 1 / (1 - continue_probability)
+        continue_probability = max(0.0, 1 - 1 / max(mean, 1))
+        limit = min(len(doctor_ids), 25)
+        
+        mappings = []
+        for patient_id in patient_ids:
+            if mean < 1 and rng.random() >= mean:
+                continue
+            wanted = 1
+            while wanted < limit and rng.random() < continue_probability:
+                wanted += 1
+            assigned = set()
+            while len(assigned) < wanted:
+                assigned.update(rng.choices(ranked, weights=popularity, k=wanted - len(assigned)))
+            mappings.extend(
+                PatientDoctorMapping(patient_id=patient_id, doctor_id=doctor_id, status=_pick(rng, STATUS_WEIGHTS))
+                for doctor_id in assigned
+            )
+        
+        PatientDoctorMapping.objects.bulk_create(mappings, batch_size=batch_size)
+        return len(mappings)
@@ -1,5 +1,9 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
+from healthcare_api.caseload import caseload_update_fields
+from healthcare_api.search import build_search_document
 
 User = get_user_model()
 
@@ -43,14 +47,45 @@ class Patient(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    search_document = SearchVectorField(null=True, editable=False)
+    # Mappings by status, maintained by healthcare_api.caseload
+    active_mapping_count = models.PositiveIntegerField(default=0, editable=False)
+    inactive_mapping_count = models.PositiveIntegerField(default=0, editable=False)
+    suspended_mapping_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    SEARCH_DOCUMENT_FIELDS = [
+        ('first_name', 'A'),
+        ('last_name', 'A'),
+        ('email', 'B'),
+    ]
+    
+    EXPORT_FIELDS = [
+        'id', 'first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'gender',
+        'blood_type', 'address', 'city', 'state', 'postal_code', 'medical_history',
+        'allergies', 'emergency_contact', 'emergency_phone', 'is_active',
+        'created_at', 'updated_at',
+    ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
     
     class Meta:
         ordering = ['-created_at']
+        # user is indexed by its one-to-one unique constraint; every read is
+        # scoped to one user, so is_active needs no index of its own
         indexes = [
-            models.Index(fields=['user']),
             models.Index(fields=['email']),
-            models.Index(fields='-created_at'),
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['updated_at', 'id']),
+            GinIndex(fields=['search_document']),
         ]
+    
+    def save(self, *args, **kwargs):
+        """Save the instance and its search document in the same statement, leaving the counters alone"""
+        self.search_document = build_search_document(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = caseload_update_fields(self)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'search_document'}
+        super().save(*args, **kwargs)
@@ -15,6 +15,7 @@ class PatientSerializer(serializers.ModelSerializer):
             'date_of_birth', 'gender', 'blood_type', 'address', 'city',
             'state', 'postal_code', 'medical_history', 'allergies',
             'emergency_contact', 'emergency_phone', 'is_active',
+            'active_mapping_count', 'inactive_mapping_count', 'suspended_mapping_count',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
@@ -1,8 +1,15 @@
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from patients.models import Patient
 from patients.serializers import PatientSerializer, PatientCreateUpdateSerializer
+from healthcare_api.conditional import ConditionalGetMixin
+from healthcare_api.export import ExportMixin
+from healthcare_api.representation import ValuesRepresentationMixin
+from healthcare_api.eager_loading import setup_eager_loading
+from healthcare_api.streaming import stream_json_list, streaming_content
+from sync.mixins import ChangeFeedMixin
 
 
 class IsPatientOwner(permissions.BasePermission):
@@ -12,15 +19,23 @@ class IsPatientOwner(permissions.BasePermission):
         return obj.user == request.user
 
 
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(ConditionalGetMixin, ChangeFeedMixin, ExportMixin, ValuesRepresentationMixin, viewsets.ModelViewSet):
     """ViewSet for Patient CRUD operations"""
     
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'user__updated_at']
+    change_feed_key = 'patients'
     serializer_class = PatientSerializer
+    keyset_ordering = ['-created_at', '-id']
     
     def get_queryset(self):
         """Return patients for the authenticated user"""
-        return Patient.objects.filter(user=self.request.user)
+        queryset = Patient.objects.filter(user=self.request.user)
+        return setup_eager_loading(queryset, self.get_serializer_class())
+    
+    def get_tombstone_queryset(self):
+        """Return deletions of the authenticated user's patients"""
+        return super().get_tombstone_queryset().filter(owner_id=self.request.user.pk)
     
     def get_serializer_class(self):
         """Use different serializer for different actions"""
@@ -47,21 +62,50 @@ class PatientViewSet(viewsets.ModelViewSet):
     
     def list(self, request, *args, **kwargs):
         """List all patients for authenticated user"""
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
+        queryset = self.filter_queryset(self.get_queryset())
+        if request.query_params.get('stream') == 'true':
+            # Streamed lists carry no validators: the rows are only known once they have been sent
+            return StreamingHttpResponse(
+                streaming_content(request, stream_json_list(
+                    'patients', queryset, self.get_serializer_class(),
+                    context=self.get_serializer_context()
+                )),
+                content_type='application/json'
+            )
+        
+        rows = self.get_values_queryset(queryset)
+        page = self.paginate_queryset(rows)
+        rows = page if page is not None else list(rows)
+        count = self.paginator.count if page is not None else len(rows)
+        validators = self.get_list_validators(rows, count)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        data = self.represent_rows(rows)
+        if page is not None:
+            return validators.apply(self.get_paginated_response({
+                'count': count,
+                'patients': data
+            }))
+        
+        return validators.apply(Response(
             {
-                'count': len(serializer.data),
-                'patients': serializer.data
+                'count': count,
+                'patients': data
             },
             status=status.HTTP_200_OK
-        )
+        ))
     
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a specific patient"""
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        validators = self.get_object_validators(instance)
+        not_modified = validators.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        
+        return validators.apply(Response(self.represent_object(instance), status=status.HTTP_200_OK))
     
     def update(self, request, *args, **kwargs):
         """Update a patient (full update)"""
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from sync.models import Tombstone
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ('model', 'object_id', 'owner_id', 'deleted_at')
+    list_filter = ('model', 'deleted_at')
+    ordering = ('-id',)
+    readonly_fields = ('model', 'object_id', 'owner_id', 'deleted_at')
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    """Delete deletion records older than the change feed's retention window"""
+    
+    help = 'Delete Tombstone rows older than SYNC_TOMBSTONE_RETENTION_DAYS; clients with older tokens resync fully.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='retention in days (default: SYNC_TOMBSTONE_RETENTION_DAYS)'
+        )
+    
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.SYNC_TOMBSTONE_RETENTION_DAYS
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted = 0
+        while True:
+            pks = list(
+                Tombstone.objects.filter(deleted_at__lt=cutoff).order_by().values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not pks:
+                break
+            deleted += Tombstone.objects.filter(pk__in=pks).delete()[0]
+        self.stdout.write(f"tombstones: {deleted} rows older than {days} days deleted")
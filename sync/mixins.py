@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from healthcare_api.pagination import keyset_filter
+from sync.models import Tombstone
+
+CHANGE_FEED_ORDERING = ('updated_at', 'id')
+
+
+def encode_watermark(updated_at, object_id, tombstone_id):
+    """Encode a change-feed position, and when it was issued, as an opaque token"""
+    payload = {
+        'u': updated_at.isoformat() if updated_at else None,
+        'i': object_id,
+        't': tombstone_id,
+        's': timezone.now().isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii')).decode('ascii')
+
+
+def decode_watermark(token):
+    """Decode a token produced by :func:`encode_watermark`; the issue time is ``None`` for older tokens"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('ascii'))
+        updated_at = parse_datetime(payload['u']) if payload['u'] else None
+        object_id = int(payload['i']) if payload['i'] is not None else None
+        issued_at = parse_datetime(payload['s']) if payload.get('s') else None
+        return updated_at, object_id, int(payload['t']), issued_at
+    except Exception:
+        raise ValidationError({'updated_since': 'Invalid sync token.'})
+
+
+class ChangeFeedMixin:
+    """ViewSet mixin adding a ``changes`` action for incremental sync.
+    
+    ``GET changes/?updated_since=<token>`` returns rows of ``get_queryset()``
+    changed after the token, ordered by ``(updated_at, id)``, and the ids of
+    rows deleted since then. The response carries ``next_token`` for the next
+    call; omit ``updated_since`` to start a full sync. Rows and deletions from
+    the last ``SYNC_SETTLE_SECONDS`` are held back until a later call, so
+    transactions that commit out of timestamp order are not skipped.
+    Tombstones are pruned after ``SYNC_TOMBSTONE_RETENTION_DAYS``, so a token
+    older than that starts a full resync, flagged with ``full_resync``.
+    """
+    
+    change_feed_key = 'results'
+    
+    def get_tombstone_queryset(self):
+        """Return the deletions visible to the requesting user"""
+        model = self.get_queryset().model
+        return Tombstone.objects.filter(model=model._meta.label_lower)
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """Get rows changed and deleted since a sync token"""
+        try:
+            limit = int(request.query_params.get('limit') or settings.SYNC_PAGE_SIZE)
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        limit = max(1, min(limit, settings.SYNC_MAX_PAGE_SIZE))
+        horizon = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        tombstones = self.get_tombstone_queryset().filter(deleted_at__lt=horizon)
+        
+        token = request.query_params.get('updated_since')
+        full_resync = True
+        if token:
+            updated_at, object_id, tombstone_id, issued_at = decode_watermark(token)
+            # Deletions since an older token may already have been pruned
+            retention = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+            full_resync = issued_at is None or issued_at < retention
+        if full_resync:
+            # A client starting from scratch has nothing to delete
+            updated_at, object_id = None, None
+            tombstone_id = tombstones.aggregate(last=Max('id'))['last'] or 0
+        
+        queryset = self.get_queryset().filter(updated_at__lt=horizon).order_by(*CHANGE_FEED_ORDERING)
+        if updated_at is not None:
+            queryset = queryset.filter(keyset_filter([updated_at, object_id], CHANGE_FEED_ORDERING))
+        rows = list(queryset[:limit + 1])
+        
+        deleted = list(
+            tombstones.filter(id__gt=tombstone_id).order_by('id').values_list('id', 'object_id')[:limit + 1]
+        )
+        has_more = len(rows) > limit or len(deleted) > limit
+        rows = rows[:limit]
+        deleted = deleted[:limit]
+        
+        if rows:
+            updated_at, object_id = rows[-1].updated_at, rows[-1].pk
+        if deleted:
+            tombstone_id = deleted[-1][0]
+        
+        serializer = self.get_serializer(rows, many=True)
+        return Response(
+            {
+                self.change_feed_key: serializer.data,
+                'deleted': [deleted_id for _, deleted_id in deleted],
+                'next_token': encode_watermark(updated_at, object_id, tombstone_id),
+                'has_more': has_more,
+                'full_resync': full_resync
+            },
+            status=status.HTTP_200_OK
+        )
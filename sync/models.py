@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """Record of a deleted row, kept so delta-sync clients can delete it too"""
+    
+    model = models.CharField(max_length=100, help_text="Model label, e.g. doctors.doctor")
+    object_id = models.BigIntegerField()
+    owner_id = models.BigIntegerField(null=True, blank=True, help_text="User the row belonged to, for per-user feeds")
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.model}:{self.object_id}"
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['model', 'id']),
+            models.Index(fields=['deleted_at']),
+        ]
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from sync.models import Tombstone
+
+
+@receiver(post_delete, sender=Doctor)
+@receiver(post_delete, sender=PatientDoctorMapping)
+def record_tombstone(sender, instance, **kwargs):
+    """Record a deletion for the change feed, including cascaded deletes"""
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+@receiver(post_delete, sender=Patient)
+def record_patient_tombstone(sender, instance, **kwargs):
+    """Record a patient deletion, scoped to the user who owned it"""
+    Tombstone.objects.create(
+        model=sender._meta.label_lower,
+        object_id=instance.pk,
+        owner_id=instance.user_id
+    )